@@ -9,33 +9,34 @@ import sys
 import os
 import time
 import random
-import threading
-from dataclasses import dataclass
-from typing import List, Optional
+from typing import Optional, TextIO
 
 # Add lib to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
-from tinykit import Canvas, ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size, SimpleInput
-
-
-@dataclass
-class Snowflake:
-    x: float
-    y: float
-    char: str
-    speed: float
-    drift: float
-    fragment: Optional[str] = None
+from tinykit import ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size
+from tinyscreen import Screen
+from tinyloop import FrameScheduler, drive
+from tinyprof import FrameProfiler
+from tinyinput import KeyReader, reading_keys, KeyEvent, CTRL_C, KEY_LEFT, KEY_RIGHT
+from tinyparticles import ParticleSystem, NO_TAG
 
 
 class WinterHush:
-    def __init__(self):
+    def __init__(self, terminal_size: Optional[os.terminal_size] = None,
+                 rng: Optional[random.Random] = None, out: Optional[TextIO] = None):
+        # Size, randomness and output can be injected for headless runs
         self.running = False
-        self.terminal_size = get_terminal_size()
-        self.canvas = Canvas(self.terminal_size.columns, self.terminal_size.lines - 1, ArtisticThemes.WINTER)
-        self.snowflakes: List[Snowflake] = []
+        self.terminal_size = terminal_size or get_terminal_size()
+        self.rng = rng or random.Random()
+        self.profiler = FrameProfiler()
+        self.canvas = Screen(self.terminal_size.columns, self.terminal_size.lines - 1, ArtisticThemes.WINTER, out=out, profiler=self.profiler)
+        # Snowflakes as columns: x, y, drift (vx), speed (vy), char and
+        # fragment ids, stepped all at once
+        self.snowflakes = ParticleSystem()
         self.caught_fragments = []
         self.cursor_x = self.terminal_size.columns // 2
+        self.scheduler = FrameScheduler(fps=20)
+        self.last_snowflake = 0.0
         
         # Text fragments hidden in snowflakes
         self.fragments = [
@@ -56,74 +57,77 @@ class WinterHush:
             "stillness speaks volumes"
         ]
         
+        # Every fragment, indexed by the ids snowflakes carry
+        self.fragment_texts = tuple(self.fragments)
+        
         # Snowflake characters
         self.snow_chars = ["❄", "❅", "❆", "*", "·", "•", "○"]
     
-    def create_snowflake(self):
-        """Create a new snowflake at the top of the screen."""
-        x = random.uniform(0, self.terminal_size.columns - 1)
-        char = random.choice(self.snow_chars)
-        speed = random.uniform(0.1, 0.3)
-        drift = random.uniform(-0.1, 0.1)
+    def create_snowflake(self) -> int:
+        """Create a new snowflake at the top of the screen; returns its index."""
+        x = self.rng.uniform(0, self.terminal_size.columns - 1)
+        char = self.rng.randrange(len(self.snow_chars))
+        speed = self.rng.uniform(0.1, 0.3)
+        drift = self.rng.uniform(-0.1, 0.1)
         
         # Some snowflakes carry text fragments
-        fragment = None
-        if random.random() < 0.25 and self.fragments:  # 25% chance
-            fragment = random.choice(self.fragments)
+        fragment = NO_TAG
+        if self.rng.random() < 0.25 and self.fragments:  # 25% chance
+            fragment = self.fragment_texts.index(self.rng.choice(self.fragments))
         
-        return Snowflake(x, 0, char, speed, drift, fragment)
+        return self.snowflakes.spawn(x, 0, drift, speed, glyph=char, tag=fragment)
     
     def update_snowflakes(self):
         """Update snowflake positions."""
         # Remove snowflakes that have fallen off screen
-        self.snowflakes = [s for s in self.snowflakes if s.y < self.terminal_size.lines]
+        self.snowflakes.cull(self.terminal_size.lines)
         
-        # Update positions
-        for flake in self.snowflakes:
-            flake.y += flake.speed
-            flake.x += flake.drift
-            
-            # Wrap around horizontally
-            if flake.x < 0:
-                flake.x = self.terminal_size.columns - 1
-            elif flake.x >= self.terminal_size.columns:
-                flake.x = 0
+        # Update positions, wrapping around horizontally
+        self.snowflakes.step(self.terminal_size.columns)
     
     def check_catches(self):
         """Check if cursor caught any snowflakes."""
-        caught = []
-        remaining = []
-        
         cursor_y = self.terminal_size.lines - 3  # Cursor position
         
-        for flake in self.snowflakes:
-            # Check if snowflake is near cursor (expanded collision area)
-            # Use a larger collision area and account for floating point positions
-            x_distance = abs(flake.x - self.cursor_x)
-            y_distance = abs(flake.y - cursor_y)
-            
-            if (x_distance <= 2.0 and y_distance <= 1.5):
-                caught.append(flake)
-                if flake.fragment:
-                    self.caught_fragments.append(flake.fragment)
-                    # Remove from available fragments
-                    if flake.fragment in self.fragments:
-                        self.fragments.remove(flake.fragment)
-            else:
-                remaining.append(flake)
-        
-        self.snowflakes = remaining
+        # Snowflakes near the cursor (expanded collision area, which
+        # accounts for floating point positions)
+        caught = self.snowflakes.within(self.cursor_x - 2.0, cursor_y - 1.5,
+                                        self.cursor_x + 2.0, cursor_y + 1.5)
+        for i in caught:
+            tag = self.snowflakes.tag[i]
+            if tag != NO_TAG:
+                fragment = self.fragment_texts[tag]
+                self.caught_fragments.append(fragment)
+                # Remove from available fragments
+                if fragment in self.fragments:
+                    self.fragments.remove(fragment)
+        
+        if caught:
+            self.snowflakes.remove(caught)
         return len(caught) > 0
     
+    def tick(self):
+        """Advance the simulation by one fixed step."""
+        # Create new snowflakes periodically
+        if self.scheduler.time - self.last_snowflake > self.rng.uniform(0.1, 0.5):
+            self.create_snowflake()
+            self.last_snowflake = self.scheduler.time
+        
+        self.update_snowflakes()
+        with self.profiler.section("check_catches"):
+            self.check_catches()
+    
     def render_frame(self):
         """Render a single frame."""
         self.canvas.clear()
         
         # Draw snowflakes
-        for flake in self.snowflakes:
-            if 0 <= int(flake.x) < self.terminal_size.columns and 0 <= int(flake.y) < self.terminal_size.lines - 1:
-                color = self.canvas.theme.accent if flake.fragment else self.canvas.theme.primary
-                self.canvas.put_char(int(flake.x), int(flake.y), flake.char, color)
+        theme = self.canvas.theme
+        snow_chars = self.snow_chars
+        self.canvas.put_chars(
+            (x, y, snow_chars[char], theme.accent if fragment != NO_TAG else theme.primary)
+            for x, y, char, fragment in self.snowflakes.cells(self.terminal_size.columns,
+                                                              self.terminal_size.lines - 1))
         
         # Draw cursor (a small shelter)
         cursor_y = self.terminal_size.lines - 3
@@ -148,31 +152,21 @@ class WinterHush:
                     instruction,
                     self.canvas.theme.secondary
                 )
-        
-        return self.canvas.render()
     
-    def handle_input(self):
-        """Handle keyboard input in a separate thread."""
-        try:
-            while self.running:
-                try:
-                    key = SimpleInput.get_key()
-                    if key == 'q' or key == '\x03':  # q or Ctrl+C
-                        self.running = False
-                    elif key == '\x1b':  # Escape sequence
-                        next1 = SimpleInput.get_key()
-                        if next1 == '[':
-                            next2 = SimpleInput.get_key()
-                            if next2 == 'D':  # Left arrow
-                                self.cursor_x = max(0, self.cursor_x - 1)
-                            elif next2 == 'C':  # Right arrow
-                                self.cursor_x = min(self.terminal_size.columns - 1, self.cursor_x + 1)
-                except:
-                    pass
-        except:
-            pass
+    def entity_count(self) -> int:
+        """Live entities, for the profiler overlay."""
+        return len(self.snowflakes)
+
+    def handle_key(self, event: KeyEvent):
+        """Handle a single key press."""
+        if event.key == 'q' or event == CTRL_C:
+            self.running = False
+        elif event == KEY_LEFT:
+            self.cursor_x = max(0, self.cursor_x - 1)
+        elif event == KEY_RIGHT:
+            self.cursor_x = min(self.terminal_size.columns - 1, self.cursor_x + 1)
     
-    def run(self):
+    def run(self, keys: Optional[KeyReader] = None):
         """Main game loop."""
         clear_screen()
         hide_cursor()
@@ -184,32 +178,11 @@ class WinterHush:
         
         self.running = True
         
-        # Start input handler thread
-        input_thread = threading.Thread(target=self.handle_input, daemon=True)
-        input_thread.start()
-        
-        last_snowflake = time.time()
-        
         try:
-            while self.running:
-                current_time = time.time()
-                
-                # Create new snowflakes periodically
-                if current_time - last_snowflake > random.uniform(0.1, 0.5):
-                    self.snowflakes.append(self.create_snowflake())
-                    last_snowflake = current_time
-                
-                # Update simulation
-                self.update_snowflakes()
-                caught = self.check_catches()
-                
-                # Render frame
-                clear_screen()
-                print(self.render_frame())
-                
-                # Brief pause for animation
-                time.sleep(0.05)
-                
+            # Read keys without blocking; the loop polls them once per frame
+            # (the rack lends us its own reader when it launches us)
+            with reading_keys(keys) as keys:
+                drive(self, keys)
         except KeyboardInterrupt:
             pass
         finally:
@@ -9,15 +9,20 @@ import sys
 import os
 import time
 import random
-import threading
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, TextIO
 
 # Add lib to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
-from tinykit import Canvas, ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size, SimpleInput
+from tinykit import ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size
+from tinyscreen import Screen
+from tinyloop import FrameScheduler, drive
+from tinyprof import FrameProfiler
+from tinyinput import KeyReader, reading_keys, KeyEvent, CTRL_C
+from tinypool import Pool, slotted
 
 
+@slotted
 @dataclass
 class Fragment:
     x: float
@@ -29,13 +34,20 @@ class Fragment:
 
 
 class FragmentsStream:
-    def __init__(self):
+    def __init__(self, terminal_size: Optional[os.terminal_size] = None,
+                 rng: Optional[random.Random] = None, out: Optional[TextIO] = None):
+        # Size, randomness and output can be injected for headless runs
         self.running = False
-        self.terminal_size = get_terminal_size()
-        self.canvas = Canvas(self.terminal_size.columns, self.terminal_size.lines - 3, ArtisticThemes.NEBULA)
+        self.terminal_size = terminal_size or get_terminal_size()
+        self.rng = rng or random.Random()
+        self.profiler = FrameProfiler()
+        self.canvas = Screen(self.terminal_size.columns, self.terminal_size.lines - 3, ArtisticThemes.NEBULA, out=out, profiler=self.profiler)
         self.fragments: List[Fragment] = []
+        self.free_fragments = Pool(Fragment)  # recycled Fragment objects
         self.caught_fragments = []
         self.catch_zone_y = self.terminal_size.lines - 8
+        self.scheduler = FrameScheduler(fps=12.5)
+        self.last_fragment = 0.0
         
         # Text fragments that flow down
         self.fragment_pool = [
@@ -58,17 +70,14 @@ class FragmentsStream:
 
     def create_fragment(self):
         """Create a new fragment at the top of the screen."""
-        text = random.choice(self.fragment_pool)
-        x = random.uniform(0, max(0, self.terminal_size.columns - len(text) - 1))
-        speed = random.uniform(0.2, 0.5)
+        text = self.rng.choice(self.fragment_pool)
+        x = self.rng.uniform(0, max(0, self.terminal_size.columns - len(text) - 1))
+        speed = self.rng.uniform(0.2, 0.5)
         
-        return Fragment(x, 0, text, speed)
+        return self.free_fragments.acquire(x, 0, text, speed)
 
     def update_fragments(self):
         """Update fragment positions and handle catching."""
-        # Remove fragments that have fallen off screen
-        self.fragments = [f for f in self.fragments if f.y < self.terminal_size.lines - 2]
-        
         # Update positions
         for fragment in self.fragments:
             if not fragment.caught:
@@ -76,8 +85,10 @@ class FragmentsStream:
             else:
                 # Caught fragments fade and move to collection
                 fragment.fade -= 0.05
-                if fragment.fade <= 0:
-                    self.fragments.remove(fragment)
+        
+        # Remove fragments that have fallen off screen or faded away
+        bottom = self.terminal_size.lines - 2
+        self.free_fragments.sweep(self.fragments, lambda f: f.y < bottom and f.fade > 0)
 
     def try_catch_fragment(self):
         """Try to catch fragments in the catch zone."""
@@ -95,6 +106,16 @@ class FragmentsStream:
                     
         return caught_any
 
+    def tick(self):
+        """Advance the simulation by one fixed step."""
+        # Create new fragments periodically
+        if self.scheduler.time - self.last_fragment > self.rng.uniform(0.3, 0.8):
+            if self.fragment_pool:  # Only if we have fragments left
+                self.fragments.append(self.create_fragment())
+            self.last_fragment = self.scheduler.time
+        
+        self.update_fragments()
+
     def render_frame(self):
         """Render a single frame."""
         self.canvas.clear()
@@ -144,25 +165,19 @@ class FragmentsStream:
                 count_text,
                 self.canvas.theme.secondary
             )
-        
-        return self.canvas.render()
 
-    def handle_input(self):
-        """Handle keyboard input in a separate thread."""
-        try:
-            while self.running:
-                try:
-                    key = SimpleInput.get_key()
-                    if key == 'q' or key == '\x03':  # q or Ctrl+C
-                        self.running = False
-                    elif key == ' ':  # Space to catch
-                        self.try_catch_fragment()
-                except:
-                    pass
-        except:
-            pass
+    def entity_count(self) -> int:
+        """Live entities, for the profiler overlay."""
+        return len(self.fragments)
+
+    def handle_key(self, event: KeyEvent):
+        """Handle a single key press."""
+        if event.key == 'q' or event == CTRL_C:
+            self.running = False
+        elif event.key == ' ':  # Space to catch
+            self.try_catch_fragment()
 
-    def run(self):
+    def run(self, keys: Optional[KeyReader] = None):
         """Main game loop."""
         clear_screen()
         hide_cursor()
@@ -174,32 +189,11 @@ class FragmentsStream:
         
         self.running = True
         
-        # Start input handler thread
-        input_thread = threading.Thread(target=self.handle_input, daemon=True)
-        input_thread.start()
-        
-        last_fragment = time.time()
-        
         try:
-            while self.running:
-                current_time = time.time()
-                
-                # Create new fragments periodically
-                if current_time - last_fragment > random.uniform(0.3, 0.8):
-                    if self.fragment_pool:  # Only if we have fragments left
-                        self.fragments.append(self.create_fragment())
-                    last_fragment = current_time
-                
-                # Update simulation
-                self.update_fragments()
-                
-                # Render frame
-                clear_screen()
-                print(self.render_frame())
-                
-                # Brief pause for animation
-                time.sleep(0.08)
-                
+            # Read keys without blocking; the loop polls them once per frame
+            # (the rack lends us its own reader when it launches us)
+            with reading_keys(keys) as keys:
+                drive(self, keys)
         except KeyboardInterrupt:
             pass
         finally:
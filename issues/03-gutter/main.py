@@ -8,41 +8,68 @@ Experience sequential art in the terminal.
 import sys
 import os
 import time
-import threading
-from dataclasses import dataclass
-from typing import List, Optional
+import random
+from collections import OrderedDict
+from typing import Optional, TextIO, Tuple
 
 # Add lib to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
-from tinykit import Canvas, ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size, SimpleInput
+from tinykit import ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size
+from tinyscreen import Screen, Snapshot, text_width
+from tinycomic import ComicFile, ComicPage, Panel
+from tinyloop import FrameScheduler, drive
+from tinyprof import FrameProfiler
+from tinyinput import KeyReader, reading_keys, KeyEvent, CTRL_C, KEY_LEFT, KEY_RIGHT
 
 
-@dataclass
-class Panel:
-    x: int
-    y: int
-    width: int
-    height: int
-    content: List[str]
-    dialogue: str = ""
-    highlighted: bool = False
-
-
-class ComicPage:
-    def __init__(self, title: str, panels: List[Panel]):
-        self.title = title
-        self.panels = panels
-        self.current_panel = 0
+class PageCache:
+    """Pages already drawn, as snapshots of the canvas, least recently read dropped first."""
+    
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.size: Optional[Tuple[int, int]] = None  # terminal size the pages were laid out for
+        self._pages: "OrderedDict[tuple, Snapshot]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, size: Tuple[int, int], view: tuple) -> Optional[Snapshot]:
+        if size != self.size:
+            # Every page was laid out and clipped for the old size
+            self._pages.clear()
+            self.size = size
+        snapshot = self._pages.get(view)
+        if snapshot is None:
+            self.misses += 1
+        else:
+            self._pages.move_to_end(view)
+            self.hits += 1
+        return snapshot
+    
+    def put(self, view: tuple, snapshot: Snapshot):
+        self._pages[view] = snapshot
+        self._pages.move_to_end(view)
+        while len(self._pages) > self.capacity:
+            self._pages.popitem(last=False)
 
 
 class GutterReader:
-    def __init__(self):
+    def __init__(self, terminal_size: Optional[os.terminal_size] = None,
+                 rng: Optional[random.Random] = None, out: Optional[TextIO] = None,
+                 comic: Optional[str] = None):
+        # Size, randomness and output can be injected for headless runs
         self.running = False
-        self.terminal_size = get_terminal_size()
-        self.canvas = Canvas(self.terminal_size.columns, self.terminal_size.lines - 3, ArtisticThemes.MINIMAL)
-        self.pages = self.create_comic_pages()
+        self.terminal_size = terminal_size or get_terminal_size()
+        self.rng = rng or random.Random()
+        self.profiler = FrameProfiler()
+        self.canvas = Screen(self.terminal_size.columns, self.terminal_size.lines - 3, ArtisticThemes.MINIMAL, out=out, profiler=self.profiler)
+        # A comic file is read a page at a time; without one, the issue's own comic
+        self.comic = ComicFile(comic) if comic else None
+        self.pages = self.comic if self.comic is not None else self.create_comic_pages()
         self.current_page = 0
         self.reading_mode = "page"  # "page" or "panel"
+        self.drawn_view = None  # (page, mode, panel, overlay) currently on the canvas
+        self.page_cache = PageCache()
+        self.scheduler = FrameScheduler(fps=10, on_change=True)
         
     def create_comic_pages(self):
         """Create a weird experimental comic in the spirit of FRANK/Annie Koyama."""
@@ -138,29 +165,57 @@ class GutterReader:
 
     def render_page(self):
         """Render the current page."""
-        self.canvas.clear()
-        
         current_page_obj = self.pages[self.current_page]
         
+        # Pages are static: only redraw when the reader moved, or the
+        # profiler overlay came or went
+        view = (self.current_page, self.reading_mode, current_page_obj.current_panel,
+                self.profiler.visible)
+        if view == self.drawn_view:
+            return
+        self.drawn_view = view
+        
+        # A page looks the same every time it is turned to, so it is drawn
+        # once per view and copied back onto the canvas after that; the
+        # panel only matters in panel mode
+        page_view = (self.current_page, self.reading_mode,
+                     current_page_obj.current_panel if self.reading_mode == "panel" else None)
+        size = (self.terminal_size.columns, self.terminal_size.lines)
+        snapshot = self.page_cache.get(size, page_view)
+        if snapshot is not None:
+            self.canvas.blit(snapshot)
+            return
+        
+        self.canvas.clear()
+        self.draw_page(current_page_obj)
+        self.page_cache.put(page_view, self.canvas.snapshot())
+
+    def draw_page(self, current_page_obj: ComicPage):
+        """Draw a page, its panels and the navigation line onto a cleared canvas."""
         # Draw title
         title = f"Page {self.current_page + 1}: {current_page_obj.title}"
         self.canvas.put_text(2, 0, title, self.canvas.theme.accent)
         
-        # Draw panels
+        # Draw panels, as many rows of each as fit above the navigation
+        visible_rows = current_page_obj.visible_rows(self.canvas.width, self.canvas.height)
         for i, panel in enumerate(current_page_obj.panels):
             # Highlight current panel in panel mode
             border_color = self.canvas.theme.accent if (self.reading_mode == "panel" and i == current_page_obj.current_panel) else self.canvas.theme.border
             
-            # Draw panel content
-            for j, line in enumerate(panel.content):
-                if panel.y + j < self.terminal_size.lines - 3:
-                    self.canvas.put_text(panel.x, panel.y + j, line, border_color)
+            # Draw panel content; pages from a compiled bundle come as cells
+            if panel.cells is not None:
+                for j in range(visible_rows[i]):
+                    self.canvas.put_cells(panel.x, panel.y + j, panel.cells[j], border_color,
+                                          wide=current_page_obj.wide)
+            else:
+                for j in range(visible_rows[i]):
+                    self.canvas.put_text(panel.x, panel.y + j, panel.content[j], border_color)
             
             # Draw dialogue if in panel mode and this is the current panel
             if self.reading_mode == "panel" and i == current_page_obj.current_panel and panel.dialogue:
                 dialogue_y = self.terminal_size.lines - 5
                 dialogue_text = f"💬 {panel.dialogue}"
-                if len(dialogue_text) <= self.terminal_size.columns - 4:
+                if text_width(dialogue_text) <= self.terminal_size.columns - 4:
                     self.canvas.put_text(2, dialogue_y, dialogue_text, self.canvas.theme.secondary)
         
         # Draw navigation info
@@ -174,45 +229,34 @@ class GutterReader:
         
         if len(nav_text) <= self.terminal_size.columns:
             self.canvas.put_text(0, nav_y, nav_text, self.canvas.theme.secondary)
-        
-        return self.canvas.render()
 
-    def handle_input(self):
-        """Handle keyboard input in a separate thread."""
-        try:
-            while self.running:
-                try:
-                    key = SimpleInput.get_key()
-                    if key == 'q' or key == '\x03':  # q or Ctrl+C
-                        self.running = False
-                    elif key == ' ':  # Space to toggle mode
-                        if self.reading_mode == "page":
-                            self.reading_mode = "panel"
-                            self.pages[self.current_page].current_panel = 0
-                        else:
-                            self.reading_mode = "page"
-                    elif key == '\x1b':  # Escape sequence
-                        next1 = SimpleInput.get_key()
-                        if next1 == '[':
-                            next2 = SimpleInput.get_key()
-                            if next2 == 'D':  # Left arrow
-                                if self.reading_mode == "page":
-                                    self.current_page = max(0, self.current_page - 1)
-                                else:
-                                    current_page_obj = self.pages[self.current_page]
-                                    current_page_obj.current_panel = max(0, current_page_obj.current_panel - 1)
-                            elif next2 == 'C':  # Right arrow
-                                if self.reading_mode == "page":
-                                    self.current_page = min(len(self.pages) - 1, self.current_page + 1)
-                                else:
-                                    current_page_obj = self.pages[self.current_page]
-                                    current_page_obj.current_panel = min(len(current_page_obj.panels) - 1, current_page_obj.current_panel + 1)
-                except:
-                    pass
-        except:
-            pass
+    def handle_key(self, event: KeyEvent):
+        """Handle a single key press."""
+        if event.key == 'q' or event == CTRL_C:
+            self.running = False
+        elif event.key == ' ':  # Space to toggle mode
+            if self.reading_mode == "page":
+                self.reading_mode = "panel"
+                self.pages[self.current_page].current_panel = 0
+            else:
+                self.reading_mode = "page"
+        elif event == KEY_LEFT:
+            if self.reading_mode == "page":
+                self.current_page = max(0, self.current_page - 1)
+            else:
+                current_page_obj = self.pages[self.current_page]
+                current_page_obj.current_panel = max(0, current_page_obj.current_panel - 1)
+        elif event == KEY_RIGHT:
+            if self.reading_mode == "page":
+                self.current_page = min(len(self.pages) - 1, self.current_page + 1)
+            else:
+                current_page_obj = self.pages[self.current_page]
+                current_page_obj.current_panel = min(len(current_page_obj.panels) - 1, current_page_obj.current_panel + 1)
+        
+        # Pages only change on a keypress
+        self.scheduler.mark_dirty()
 
-    def run(self):
+    def run(self, keys: Optional[KeyReader] = None):
         """Main reader loop."""
         clear_screen()
         hide_cursor()
@@ -224,22 +268,16 @@ class GutterReader:
         
         self.running = True
         
-        # Start input handler thread
-        input_thread = threading.Thread(target=self.handle_input, daemon=True)
-        input_thread.start()
-        
         try:
-            while self.running:
-                # Render frame
-                clear_screen()
-                print(self.render_page())
-                
-                # Brief pause for smooth updates
-                time.sleep(0.1)
-                
+            # Read keys without blocking; the loop polls them once per frame
+            # (the rack lends us its own reader when it launches us)
+            with reading_keys(keys) as keys:
+                drive(self, keys)
         except KeyboardInterrupt:
             pass
         finally:
+            if self.comic is not None:
+                self.comic.close()
             show_cursor()
             clear_screen()
             
@@ -253,5 +291,6 @@ class GutterReader:
 
 
 if __name__ == "__main__":
-    reader = GutterReader()
+    # python main.py [comic file]
+    reader = GutterReader(comic=sys.argv[1] if len(sys.argv) > 1 else None)
     reader.run()
\ No newline at end of file
@@ -9,15 +9,20 @@ import sys
 import os
 import time
 import random
-import threading
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, TextIO
 
 # Add lib to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
-from tinykit import Canvas, ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size, SimpleInput
+from tinykit import ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size
+from tinyscreen import Screen
+from tinyloop import FrameScheduler, drive
+from tinyprof import FrameProfiler
+from tinyinput import KeyReader, reading_keys, InputEvent, PasteEvent, CTRL_C, KEY_ENTER, KEY_BACKSPACE
+from tinypool import Pool, slotted
 
 
+@slotted
 @dataclass
 class Echo:
     text: str
@@ -29,14 +34,25 @@ class Echo:
 
 
 class EchoChamber:
-    def __init__(self):
+    def __init__(self, terminal_size: Optional[os.terminal_size] = None,
+                 rng: Optional[random.Random] = None, out: Optional[TextIO] = None):
+        # Size, randomness and output can be injected for headless runs
         self.running = False
-        self.terminal_size = get_terminal_size()
-        self.canvas = Canvas(self.terminal_size.columns, self.terminal_size.lines - 4, ArtisticThemes.MINIMAL)
+        self.terminal_size = terminal_size or get_terminal_size()
+        self.rng = rng or random.Random()
+        # Glitches come from a generator of their own, reseeded from the tick
+        # on every frame, so however many frames get drawn the simulation
+        # draws the same numbers and a tick always looks the same
+        self.render_rng = random.Random()
+        self.glitch_seed = 0
+        self.profiler = FrameProfiler()
+        self.canvas = Screen(self.terminal_size.columns, self.terminal_size.lines - 4, ArtisticThemes.MINIMAL, out=out, profiler=self.profiler)
         self.echoes: List[Echo] = []
+        self.free_echoes = Pool(Echo)  # recycled Echo objects
         self.input_text = ""
         self.cursor_pos = 0
         self.echo_count = 0
+        self.scheduler = FrameScheduler(fps=10)
         
         # Distortion characters for glitch effects
         self.distortion_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?~`"
@@ -58,6 +74,15 @@ class EchoChamber:
             "only echoes remain"
         ]
 
+    def start(self):
+        """Set the chamber up; drive() and headless runs call this once rng is seeded."""
+        self.glitch_seed = self.rng.getrandbits(32)
+        
+        # Add some initial echoes to set the mood
+        self.add_echo("Welcome to the echo chamber...")
+        self.add_echo("  Your words will be transformed here")
+        self.add_echo("    Speak into the digital void")
+
     def distort_text(self, text: str, distortion_level: float) -> str:
         """Apply distortion effects to text."""
         if distortion_level <= 0:
@@ -65,11 +90,11 @@ class EchoChamber:
             
         result = ""
         for char in text:
-            if random.random() < distortion_level:
+            if self.render_rng.random() < distortion_level:
                 if char == ' ':
                     result += ' '
                 else:
-                    result += random.choice(self.distortion_chars)
+                    result += self.render_rng.choice(self.distortion_chars)
             else:
                 result += char
         return result
@@ -83,12 +108,13 @@ class EchoChamber:
         base_y = 5 + len(self.echoes) * 2
         if base_y >= self.terminal_size.lines - 6:
             # Remove oldest echoes if we're running out of space
-            self.echoes = self.echoes[-10:]
+            self.free_echoes.release_all(self.echoes[:-10])
+            del self.echoes[:-10]
             base_y = 5 + len(self.echoes) * 2
         
-        x = random.randint(2, max(2, self.terminal_size.columns - len(text) - 2))
+        x = self.rng.randint(2, max(2, self.terminal_size.columns - len(text) - 2))
         
-        echo = Echo(
+        echo = self.free_echoes.acquire(
             text=text,
             x=x,
             y=base_y + delay,
@@ -101,7 +127,7 @@ class EchoChamber:
 
     def update_echoes(self):
         """Update all echoes - aging, distortion, fading."""
-        for echo in self.echoes[:]:
+        for echo in self.echoes:
             echo.age += 1
             
             # Increase distortion over time
@@ -111,10 +137,13 @@ class EchoChamber:
             # Start fading after some time
             if echo.age > 50:
                 echo.fade = max(0, 1.0 - (echo.age - 50) * 0.05)
-            
-            # Remove completely faded echoes
-            if echo.fade <= 0:
-                self.echoes.remove(echo)
+        
+        # Remove completely faded echoes
+        self.free_echoes.sweep(self.echoes, lambda echo: echo.fade > 0)
+
+    def tick(self):
+        """Advance the simulation by one fixed step."""
+        self.update_echoes()
 
     def process_input(self, text: str):
         """Process user input and create echoes."""
@@ -137,14 +166,15 @@ class EchoChamber:
                 self.add_echo(f"  {variation}", i + 1)
         
         # Sometimes add a chamber response
-        if random.random() < 0.3:
-            response = random.choice(self.chamber_responses)
+        if self.rng.random() < 0.3:
+            response = self.rng.choice(self.chamber_responses)
             self.add_echo(f"    [{response}]", len(variations) + 1)
         
         self.echo_count += 1
 
     def render_frame(self):
         """Render the current frame."""
+        self.render_rng.seed(self.glitch_seed + self.scheduler.ticks)
         self.canvas.clear()
         
         # Title
@@ -197,38 +227,30 @@ class EchoChamber:
         stats = f"Echoes created: {self.echo_count} | Active: {len(self.echoes)} | 'q' to quit"
         if len(stats) <= self.terminal_size.columns:
             self.canvas.put_text(0, self.terminal_size.lines - 2, stats, self.canvas.theme.secondary)
-        
-        return self.canvas.render()
 
-    def handle_input(self):
-        """Handle keyboard input in a separate thread."""
-        try:
-            while self.running:
-                try:
-                    key = SimpleInput.get_key()
-                    if key == 'q' or key == '\x03':  # q or Ctrl+C
-                        self.running = False
-                    elif key == '\r' or key == '\n':  # Enter
-                        self.process_input(self.input_text)
-                        self.input_text = ""
-                    elif key == '\x7f' or key == '\b':  # Backspace
-                        if self.input_text:
-                            self.input_text = self.input_text[:-1]
-                    elif key == '\x1b':  # Escape sequences (ignore for now)
-                        try:
-                            SimpleInput.get_key()  # consume next char
-                            SimpleInput.get_key()  # consume next char
-                        except:
-                            pass
-                    elif len(key) == 1 and ord(key) >= 32:  # Printable characters
-                        if len(self.input_text) < 100:  # Limit input length
-                            self.input_text += key
-                except:
-                    pass
-        except:
-            pass
+    def entity_count(self) -> int:
+        """Live entities, for the profiler overlay."""
+        return len(self.echoes)
+
+    def handle_key(self, event: InputEvent):
+        """Handle a single key press or paste."""
+        if isinstance(event, PasteEvent):
+            # Pasted text goes into the input line, never run as commands
+            text = " ".join(event.text.split())
+            self.input_text = (self.input_text + text)[:100]
+        elif event.key == 'q' or event == CTRL_C:
+            self.running = False
+        elif event == KEY_ENTER:
+            self.process_input(self.input_text)
+            self.input_text = ""
+        elif event == KEY_BACKSPACE:
+            if self.input_text:
+                self.input_text = self.input_text[:-1]
+        elif event.char:  # Printable characters (arrows and other named keys are ignored)
+            if len(self.input_text) < 100:  # Limit input length
+                self.input_text += event.char
 
-    def run(self):
+    def run(self, keys: Optional[KeyReader] = None):
         """Main loop."""
         clear_screen()
         hide_cursor()
@@ -240,27 +262,11 @@ class EchoChamber:
         
         self.running = True
         
-        # Add some initial echoes to set the mood
-        self.add_echo("Welcome to the echo chamber...")
-        self.add_echo("  Your words will be transformed here")
-        self.add_echo("    Speak into the digital void")
-        
-        # Start input handler thread
-        input_thread = threading.Thread(target=self.handle_input, daemon=True)
-        input_thread.start()
-        
         try:
-            while self.running:
-                # Update echoes
-                self.update_echoes()
-                
-                # Render frame
-                clear_screen()
-                print(self.render_frame())
-                
-                # Brief pause for animation
-                time.sleep(0.1)
-                
+            # Read keys and pastes without blocking; the loop polls them once per frame
+            # (the rack lends us its own reader when it launches us)
+            with reading_keys(keys, paste=True) as keys:
+                drive(self, keys)
         except KeyboardInterrupt:
             pass
         finally:
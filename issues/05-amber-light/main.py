@@ -8,16 +8,23 @@ Watch system messages stream by in nostalgic monochrome warmth.
 import sys
 import os
 import time
+import datetime
 import random
-import threading
+import math
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, TextIO
 
 # Add lib to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
-from tinykit import Canvas, ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size, SimpleInput
+from tinykit import ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size
+from tinyscreen import Screen
+from tinyloop import FrameScheduler, drive
+from tinyprof import FrameProfiler
+from tinyinput import KeyReader, reading_keys, KeyEvent, CTRL_C
+from tinypool import Pool, slotted
 
 
+@slotted
 @dataclass
 class LogEntry:
     timestamp: str
@@ -28,12 +35,21 @@ class LogEntry:
 
 
 class AmberTerminal:
-    def __init__(self):
+    def __init__(self, terminal_size: Optional[os.terminal_size] = None,
+                 rng: Optional[random.Random] = None, out: Optional[TextIO] = None):
+        # Size, randomness and output can be injected for headless runs
         self.running = False
-        self.terminal_size = get_terminal_size()
-        self.canvas = Canvas(self.terminal_size.columns, self.terminal_size.lines - 2, ArtisticThemes.AMBER)
+        self.terminal_size = terminal_size or get_terminal_size()
+        self.rng = rng or random.Random()
+        self.profiler = FrameProfiler()
+        self.canvas = Screen(self.terminal_size.columns, self.terminal_size.lines - 2, ArtisticThemes.AMBER, out=out, profiler=self.profiler)
         self.log_entries: List[LogEntry] = []
+        self.free_entries = Pool(LogEntry)  # recycled LogEntry objects
         self.log_count = 0
+        self.scheduler = FrameScheduler(fps=10, on_change=True)
+        # Log times run on from here in simulation time, so a seeded run prints the same log
+        self.boot_time = datetime.datetime.now()
+        self.next_log_time = 0.0
         
         # Retro system messages
         self.system_messages = [
@@ -84,33 +100,33 @@ class AmberTerminal:
 
     def generate_timestamp(self):
         """Generate a retro-style timestamp."""
-        import datetime
-        now = datetime.datetime.now()
+        now = self.boot_time + datetime.timedelta(seconds=self.scheduler.time)
         return now.strftime("%H:%M:%S.%f")[:-3]
 
     def add_log_entry(self):
         """Add a new log entry."""
         timestamp = self.generate_timestamp()
-        level = random.choice(self.log_levels)
-        message = random.choice(self.system_messages)
+        level = self.rng.choice(self.log_levels)
+        message = self.rng.choice(self.system_messages)
         
         # Add some variation to messages
-        if random.random() < 0.3:
+        if self.rng.random() < 0.3:
             variations = [
-                f"{message} [{random.randint(1000, 9999)}]",
-                f"{message} (PID: {random.randint(100, 9999)})",
-                f"{message} - {random.choice(['OK', 'DONE', 'READY', 'ACTIVE'])}",
-                f"{message} in {random.randint(1, 999)}ms"
+                f"{message} [{self.rng.randint(1000, 9999)}]",
+                f"{message} (PID: {self.rng.randint(100, 9999)})",
+                f"{message} - {self.rng.choice(['OK', 'DONE', 'READY', 'ACTIVE'])}",
+                f"{message} in {self.rng.randint(1, 999)}ms"
             ]
-            message = random.choice(variations)
+            message = self.rng.choice(variations)
         
-        entry = LogEntry(timestamp, level, message)
+        entry = self.free_entries.acquire(timestamp, level, message)
         self.log_entries.append(entry)
         self.log_count += 1
         
         # Keep only recent entries to prevent memory issues
         if len(self.log_entries) > 100:
-            self.log_entries = self.log_entries[-50:]
+            self.free_entries.release_all(self.log_entries[:-50])
+            del self.log_entries[:-50]
 
     def update_log_entries(self):
         """Update log entry aging and glow effects."""
@@ -119,6 +135,31 @@ class AmberTerminal:
             # Fade glow over time
             entry.glow = max(0.3, 1.0 - (entry.age * 0.02))
 
+    def tick(self):
+        """Advance the simulation by one fixed step."""
+        # Add new log entries periodically
+        if self.scheduler.time >= self.next_log_time:
+            self.add_log_entry()
+            self.next_log_time = self.scheduler.time + self.rng.uniform(0.5, 2.0)
+        
+        self.update_log_entries()
+
+    def next_change(self):
+        """Simulation time at which the screen will next look different."""
+        now = self.scheduler.time
+        
+        # Next log entry, or the cursor blinking
+        candidates = [self.next_log_time, (math.floor(now * 2) + 1) / 2]
+        
+        # Entries change color as their glow drops past 0.8 and 0.5
+        for entry in self.log_entries:
+            for band_age in (10, 25):
+                if entry.age < band_age:
+                    candidates.append(now + (band_age - entry.age) * self.scheduler.tick_interval)
+                    break
+        
+        return min(candidates)
+
     def render_frame(self):
         """Render the current frame."""
         self.canvas.clear()
@@ -175,26 +216,24 @@ class AmberTerminal:
         # Cursor simulation
         cursor_x = self.terminal_size.columns - 1
         cursor_y = self.terminal_size.lines - 3
-        cursor_char = "█" if int(time.time() * 2) % 2 else " "
+        cursor_char = "█" if int(self.scheduler.time * 2) % 2 else " "
         self.canvas.put_text(cursor_x, cursor_y, cursor_char, self.canvas.theme.accent)
         
-        return self.canvas.render()
+        # Nothing on screen changes before then, so sleep until it
+        self.scheduler.wake_at(self.next_change())
 
-    def handle_input(self):
-        """Handle keyboard input in a separate thread."""
-        try:
-            while self.running:
-                try:
-                    key = SimpleInput.get_key()
-                    if key == 'q' or key == '\x03':  # q or Ctrl+C
-                        self.running = False
-                    # Ignore other keys for this demo
-                except:
-                    pass
-        except:
-            pass
+    def entity_count(self) -> int:
+        """Live entities, for the profiler overlay."""
+        return len(self.log_entries)
 
-    def run(self):
+    def handle_key(self, event: KeyEvent):
+        """Handle a single key press."""
+        if event.key == 'q' or event == CTRL_C:
+            self.running = False
+            self.scheduler.mark_dirty()  # don't sit out the idle wait
+        # Ignore other keys for this demo
+
+    def run(self, keys: Optional[KeyReader] = None):
         """Main loop."""
         clear_screen()
         hide_cursor()
@@ -206,31 +245,11 @@ class AmberTerminal:
         
         self.running = True
         
-        # Start input handler thread
-        input_thread = threading.Thread(target=self.handle_input, daemon=True)
-        input_thread.start()
-        
-        last_log_time = time.time()
-        
         try:
-            while self.running:
-                current_time = time.time()
-                
-                # Add new log entries periodically
-                if current_time - last_log_time > random.uniform(0.5, 2.0):
-                    self.add_log_entry()
-                    last_log_time = current_time
-                
-                # Update log entries
-                self.update_log_entries()
-                
-                # Render frame
-                clear_screen()
-                print(self.render_frame())
-                
-                # Brief pause for animation
-                time.sleep(0.1)
-                
+            # Read keys without blocking; the loop polls them once per frame
+            # (the rack lends us its own reader when it launches us)
+            with reading_keys(keys) as keys:
+                drive(self, keys)
         except KeyboardInterrupt:
             pass
         finally:
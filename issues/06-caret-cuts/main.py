@@ -10,15 +10,20 @@ import os
 import time
 import random
 import math
-import threading
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, TextIO, Tuple
 
 # Add lib to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'lib'))
-from tinykit import Canvas, ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size, SimpleInput
+from tinykit import ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size
+from tinyscreen import Screen
+from tinyloop import FrameScheduler, drive
+from tinyprof import FrameProfiler
+from tinyinput import KeyReader, reading_keys, InputEvent, MouseEvent, CTRL_C
+from tinypool import Pool, slotted
 
 
+@slotted
 @dataclass
 class Symbol:
     char: str
@@ -32,6 +37,7 @@ class Symbol:
     constellation_id: int = -1
 
 
+@slotted
 @dataclass
 class Constellation:
     symbols: List[Symbol]
@@ -44,14 +50,23 @@ class Constellation:
 
 
 class CaretCuts:
-    def __init__(self):
+    def __init__(self, terminal_size: Optional[os.terminal_size] = None,
+                 rng: Optional[random.Random] = None, out: Optional[TextIO] = None):
+        # Size, randomness and output can be injected for headless runs
         self.running = False
-        self.terminal_size = get_terminal_size()
-        self.canvas = Canvas(self.terminal_size.columns, self.terminal_size.lines - 2, ArtisticThemes.MINIMAL)
+        self.terminal_size = terminal_size or get_terminal_size()
+        self.rng = rng or random.Random()
+        self.profiler = FrameProfiler()
+        self.canvas = Screen(self.terminal_size.columns, self.terminal_size.lines - 2, ArtisticThemes.MINIMAL, out=out, profiler=self.profiler)
         self.symbols: List[Symbol] = []
         self.constellations: List[Constellation] = []
+        # Recycled entities; a constellation owns its symbols
+        self.free_symbols = Pool(Symbol)
+        self.free_constellations = Pool(Constellation)
         self.experiment_mode = 0  # 0: free symbols, 1: constellations, 2: micro-interactions
         self.mode_names = ["Free Symbols", "Constellations", "Micro-Interactions"]
+        self.scheduler = FrameScheduler(fps=10)
+        self.last_spawn_time = 0.0
         
         # Symbol sets for different experiments
         self.symbol_sets = {
@@ -67,48 +82,48 @@ class CaretCuts:
     def create_random_symbol(self):
         """Create a random symbol."""
         symbols = self.symbol_sets[self.current_symbol_set]
-        return Symbol(
-            char=random.choice(symbols),
-            x=random.uniform(2, self.terminal_size.columns - 3),
-            y=random.uniform(2, self.terminal_size.lines - 5),
-            rotation=random.uniform(0, 2 * math.pi),
-            rotation_speed=random.uniform(-0.1, 0.1),
-            pulse=random.uniform(0, 2 * math.pi),
-            pulse_speed=random.uniform(0.05, 0.15)
+        return self.free_symbols.acquire(
+            char=self.rng.choice(symbols),
+            x=self.rng.uniform(2, self.terminal_size.columns - 3),
+            y=self.rng.uniform(2, self.terminal_size.lines - 5),
+            rotation=self.rng.uniform(0, 2 * math.pi),
+            rotation_speed=self.rng.uniform(-0.1, 0.1),
+            pulse=self.rng.uniform(0, 2 * math.pi),
+            pulse_speed=self.rng.uniform(0.05, 0.15)
         )
 
     def create_constellation(self):
         """Create a constellation of symbols."""
-        center_x = random.uniform(10, self.terminal_size.columns - 10)
-        center_y = random.uniform(5, self.terminal_size.lines - 8)
-        num_symbols = random.randint(3, 7)
+        center_x = self.rng.uniform(10, self.terminal_size.columns - 10)
+        center_y = self.rng.uniform(5, self.terminal_size.lines - 8)
+        num_symbols = self.rng.randint(3, 7)
         
         constellation_symbols = []
         symbols = self.symbol_sets[self.current_symbol_set]
         
         for i in range(num_symbols):
             angle = (2 * math.pi * i) / num_symbols
-            radius = random.uniform(3, 8)
+            radius = self.rng.uniform(3, 8)
             
-            symbol = Symbol(
-                char=random.choice(symbols),
+            symbol = self.free_symbols.acquire(
+                char=self.rng.choice(symbols),
                 x=center_x + radius * math.cos(angle),
                 y=center_y + radius * math.sin(angle),
                 rotation=angle,
-                rotation_speed=random.uniform(-0.05, 0.05),
-                pulse=random.uniform(0, 2 * math.pi),
-                pulse_speed=random.uniform(0.03, 0.08),
+                rotation_speed=self.rng.uniform(-0.05, 0.05),
+                pulse=self.rng.uniform(0, 2 * math.pi),
+                pulse_speed=self.rng.uniform(0.03, 0.08),
                 constellation_id=len(self.constellations)
             )
             constellation_symbols.append(symbol)
         
-        constellation = Constellation(
+        constellation = self.free_constellations.acquire(
             symbols=constellation_symbols,
             center_x=center_x,
             center_y=center_y,
             rotation=0,
-            rotation_speed=random.uniform(-0.02, 0.02),
-            lifetime=random.randint(200, 500)
+            rotation_speed=self.rng.uniform(-0.02, 0.02),
+            lifetime=self.rng.randint(200, 500)
         )
         
         return constellation
@@ -126,16 +141,16 @@ class CaretCuts:
             symbol.age += 1
             
             # Gentle drift
-            if random.random() < 0.1:
-                symbol.x += random.uniform(-0.5, 0.5)
-                symbol.y += random.uniform(-0.3, 0.3)
+            if self.rng.random() < 0.1:
+                symbol.x += self.rng.uniform(-0.5, 0.5)
+                symbol.y += self.rng.uniform(-0.3, 0.3)
             
             # Keep symbols in bounds
             symbol.x = max(1, min(self.terminal_size.columns - 2, symbol.x))
             symbol.y = max(1, min(self.terminal_size.lines - 3, symbol.y))
         
         # Remove old symbols
-        self.symbols = [s for s in self.symbols if s.age < 300]
+        self.free_symbols.sweep(self.symbols, lambda s: s.age < 300)
 
     def update_constellations(self):
         """Update constellation positions and properties."""
@@ -155,26 +170,52 @@ class CaretCuts:
                 symbol.age += 1
         
         # Remove expired constellations
-        self.constellations = [c for c in self.constellations if c.age < c.lifetime]
+        for constellation in self.constellations:
+            if constellation.age >= constellation.lifetime:
+                self.free_symbols.release_all(constellation.symbols)
+        self.free_constellations.sweep(self.constellations, lambda c: c.age < c.lifetime)
 
     def create_micro_interaction(self, x: int, y: int):
         """Create a micro-interaction at the given position."""
         # Create a small burst of symbols
-        for _ in range(random.randint(3, 6)):
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(1, 4)
+        for _ in range(self.rng.randint(3, 6)):
+            angle = self.rng.uniform(0, 2 * math.pi)
+            distance = self.rng.uniform(1, 4)
             
-            symbol = Symbol(
-                char=random.choice(self.symbol_sets[self.current_symbol_set]),
+            symbol = self.free_symbols.acquire(
+                char=self.rng.choice(self.symbol_sets[self.current_symbol_set]),
                 x=x + distance * math.cos(angle),
                 y=y + distance * math.sin(angle),
                 rotation=angle,
-                rotation_speed=random.uniform(-0.2, 0.2),
+                rotation_speed=self.rng.uniform(-0.2, 0.2),
                 pulse=0,
-                pulse_speed=random.uniform(0.1, 0.3)
+                pulse_speed=self.rng.uniform(0.1, 0.3)
             )
             self.symbols.append(symbol)
 
+    def tick(self):
+        """Advance the simulation by one fixed step."""
+        # Spawn new elements based on mode
+        if self.scheduler.time - self.last_spawn_time > self.rng.uniform(0.5, 2.0):
+            if self.experiment_mode == 0:  # Free symbols
+                if len(self.symbols) < 20:
+                    self.symbols.append(self.create_random_symbol())
+            elif self.experiment_mode == 1:  # Constellations
+                if len(self.constellations) < 3:
+                    self.constellations.append(self.create_constellation())
+            elif self.experiment_mode == 2:  # Micro-interactions
+                if len(self.symbols) < 15:
+                    # Create interaction at random position
+                    x = self.rng.randint(5, self.terminal_size.columns - 5)
+                    y = self.rng.randint(3, self.terminal_size.lines - 5)
+                    self.create_micro_interaction(x, y)
+            
+            self.last_spawn_time = self.scheduler.time
+        
+        # Update elements
+        self.update_symbols()
+        self.update_constellations()
+
     def render_frame(self):
         """Render the current frame."""
         self.canvas.clear()
@@ -225,33 +266,38 @@ class CaretCuts:
         controls = "SPACE: mode | S: symbol set | CLICK: interact | Q: quit"
         if len(controls) <= self.terminal_size.columns:
             self.canvas.put_text(0, controls_y, controls, self.canvas.theme.secondary)
-        
-        return self.canvas.render()
 
-    def handle_input(self):
-        """Handle keyboard input in a separate thread."""
-        try:
-            while self.running:
-                try:
-                    key = SimpleInput.get_key()
-                    if key == 'q' or key == '\x03':  # q or Ctrl+C
-                        self.running = False
-                    elif key == ' ':  # Space - change mode
-                        self.experiment_mode = (self.experiment_mode + 1) % len(self.mode_names)
-                        # Clear existing symbols when changing modes
-                        self.symbols.clear()
-                        self.constellations.clear()
-                    elif key == 's':  # S - change symbol set
-                        symbol_sets = list(self.symbol_sets.keys())
-                        current_index = symbol_sets.index(self.current_symbol_set)
-                        self.current_symbol_set = symbol_sets[(current_index + 1) % len(symbol_sets)]
-                    # Ignore other keys for this demo
-                except:
-                    pass
-        except:
-            pass
+    def clear_symbols(self):
+        """Remove every symbol and constellation, keeping the objects for reuse."""
+        self.free_symbols.release_all(self.symbols)
+        for constellation in self.constellations:
+            self.free_symbols.release_all(constellation.symbols)
+        self.free_constellations.release_all(self.constellations)
+        self.symbols.clear()
+        self.constellations.clear()
+
+    def entity_count(self) -> int:
+        """Live entities, for the profiler overlay."""
+        return len(self.symbols) + sum(len(c.symbols) for c in self.constellations)
 
-    def run(self):
+    def handle_key(self, event: InputEvent):
+        """Handle a single key press or click."""
+        if isinstance(event, MouseEvent):
+            if event.action == "press" and event.button == "left":
+                self.create_micro_interaction(event.x, event.y)
+        elif event.key == 'q' or event == CTRL_C:
+            self.running = False
+        elif event.key == ' ':  # Space - change mode
+            self.experiment_mode = (self.experiment_mode + 1) % len(self.mode_names)
+            # Clear existing symbols when changing modes
+            self.clear_symbols()
+        elif event.key == 's':  # S - change symbol set
+            symbol_sets = list(self.symbol_sets.keys())
+            current_index = symbol_sets.index(self.current_symbol_set)
+            self.current_symbol_set = symbol_sets[(current_index + 1) % len(symbol_sets)]
+        # Ignore other keys for this demo
+
+    def run(self, keys: Optional[KeyReader] = None):
         """Main loop."""
         clear_screen()
         hide_cursor()
@@ -263,44 +309,11 @@ class CaretCuts:
         
         self.running = True
         
-        # Start input handler thread
-        input_thread = threading.Thread(target=self.handle_input, daemon=True)
-        input_thread.start()
-        
-        last_spawn_time = time.time()
-        
         try:
-            while self.running:
-                current_time = time.time()
-                
-                # Spawn new elements based on mode
-                if current_time - last_spawn_time > random.uniform(0.5, 2.0):
-                    if self.experiment_mode == 0:  # Free symbols
-                        if len(self.symbols) < 20:
-                            self.symbols.append(self.create_random_symbol())
-                    elif self.experiment_mode == 1:  # Constellations
-                        if len(self.constellations) < 3:
-                            self.constellations.append(self.create_constellation())
-                    elif self.experiment_mode == 2:  # Micro-interactions
-                        if len(self.symbols) < 15:
-                            # Create interaction at random position
-                            x = random.randint(5, self.terminal_size.columns - 5)
-                            y = random.randint(3, self.terminal_size.lines - 5)
-                            self.create_micro_interaction(x, y)
-                    
-                    last_spawn_time = current_time
-                
-                # Update elements
-                self.update_symbols()
-                self.update_constellations()
-                
-                # Render frame
-                clear_screen()
-                print(self.render_frame())
-                
-                # Brief pause for animation
-                time.sleep(0.1)
-                
+            # Read keys and clicks without blocking; the loop polls them once per frame
+            # (the rack lends us its own reader when it launches us)
+            with reading_keys(keys, mouse=True) as keys:
+                drive(self, keys)
         except KeyboardInterrupt:
             pass
         finally:
@@ -0,0 +1,141 @@
+"""
+tinyasync - run TinyTUIs on an asyncio event loop.
+
+drive() plays an issue's frame loop as a coroutine: keys arrive through
+loop.add_reader() on the KeyReader's descriptor, and the FrameScheduler's
+sleeps become awaits, so one process can host several issues (each with
+its own streams) and background tasks without a thread apiece.
+
+    async def main():
+        amber = AmberTerminal()
+        amber.running = True
+        with KeyReader() as keys:
+            await drive(amber, keys)
+
+every() covers periodic jobs that live outside the simulation's ticks.
+One that changes what is on screen calls mark_dirty(), which wakes the
+loop to draw it:
+
+    def sweep():
+        amber.free_entries.release_all(amber.log_entries)
+        amber.log_entries.clear()
+        amber.scheduler.mark_dirty()
+
+    sweeper = asyncio.ensure_future(every(300, sweep))
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Optional, Union
+
+from tinycast import cast_if_requested
+from tinyinput import InputEvent, KeyReader
+from tinyloop import frame_hooks, start_issue
+from tinyprof import dump_if_requested
+from tinyrecord import record_if_requested
+
+
+# How often to look for keys when the reader has no descriptor to watch
+THREAD_INPUT_POLL = 0.05
+
+
+async def every(interval: Union[float, Callable[[], float]],
+                callback: Callable[[], Optional[Awaitable]]):
+    """Call callback every interval seconds until cancelled.
+
+    interval may be a callable, re-evaluated before each wait, for jittered
+    timers. callback may be a plain function or return an awaitable.
+    """
+    while True:
+        await asyncio.sleep(interval() if callable(interval) else interval)
+        result = callback()
+        if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+            await result
+
+
+async def run_loop(scheduler, keys: KeyReader,
+                   handle_key: Callable[[InputEvent], None],
+                   tick: Optional[Callable[[], None]],
+                   draw: Callable[[], None],
+                   is_running: Callable[[], bool]):
+    """The ticks_due / frame_due / wait loop, with awaits where it would sleep.
+
+    Nothing here blocks the event loop: keys are read as they arrive, and
+    a lone ESC is settled by the loop once its timeout passes rather than
+    waited out in the reader.
+    """
+    loop = asyncio.get_running_loop()
+    # Set by input arriving or by mark_dirty(), from any thread
+    woken = asyncio.Event()
+
+    def wake():
+        loop.call_soon_threadsafe(woken.set)
+
+    def on_readable():
+        # Read straight away: the descriptor stays readable until we do
+        for event in keys.read_ready():
+            handle_key(event)
+        woken.set()
+
+    fd = keys.fileno()
+    if fd is not None:
+        loop.add_reader(fd, on_readable)
+    scheduler.add_waker(wake)
+    try:
+        while is_running():
+            # Keys that arrived through the thread fallback, or a lone ESC
+            # whose timeout has passed
+            for event in keys.read_ready() + keys.expire():
+                handle_key(event)
+
+            if tick is not None:
+                for _ in scheduler.ticks_due():
+                    tick()
+
+            if scheduler.frame_due():
+                draw()
+
+            # Stopped by the last key: do not wait for another one
+            if not is_running():
+                break
+            delay, idle = scheduler.pause()
+            expires = keys.expires_in()
+            if expires is not None:
+                delay = expires if delay is None else min(delay, expires)
+            if not idle:
+                await asyncio.sleep(delay)
+                continue
+
+            if fd is None:
+                delay = THREAD_INPUT_POLL if delay is None else min(delay, THREAD_INPUT_POLL)
+            try:
+                await asyncio.wait_for(woken.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            woken.clear()
+            scheduler.resume()
+    finally:
+        scheduler.remove_waker(wake)
+        if fd is not None:
+            loop.remove_reader(fd)
+
+
+async def drive(issue, keys: KeyReader):
+    """Play an issue's interactive part until it stops running.
+
+    The coroutine form of tinyloop.drive(), with the same profiling, recording and casting.
+    """
+    handle_key, tick, draw = frame_hooks(issue)
+    recorder = record_if_requested(issue)
+    if recorder is not None:
+        handle_key = recorder.hook(handle_key)
+    cast = cast_if_requested(issue)
+    start_issue(issue)
+    try:
+        await run_loop(issue.scheduler, keys, handle_key, tick, draw, lambda: issue.running)
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if cast is not None:
+            cast.close()
+        if getattr(issue, "profiler", None) is not None:
+            dump_if_requested(issue.profiler)
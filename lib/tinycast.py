@@ -0,0 +1,137 @@
+"""
+tinycast - stream TinyTUIs frames to asciicast v2 files.
+
+A Screen with a CastWriter attached hands it every frame's delta as it
+presents it, so a cast is exactly what the terminal was sent, timed by
+the issue's own clock. Under tinyheadless that clock is the manual one,
+which lets previews for the catalog be made on a build machine, with no
+terminal and no screen recorder:
+
+    issue = headless(CaretCuts, 80, 24, seed=1)
+    with open("caret.cast", "w") as f:
+        cast = attach(issue, f, collapse=True)
+        run_frames(issue, 300)
+        cast.close()
+
+Set TINYTUIS_CAST to a file name and a live issue records itself too.
+
+Events are buffered and written in large chunks rather than one write
+per frame. With collapse=True the cast is compacted for playback: frames
+that come within merge seconds of the event being held are appended to
+it (deltas are plain terminal output, so played back to back they end
+on the same screen), which caps a 20 fps issue at the rate a preview
+needs, and pauses longer than max_idle are shortened to max_idle, so a
+quiet stretch costs neither bytes nor playback time.
+"""
+
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+
+
+CAST_ENV = "TINYTUIS_CAST"
+CAST_VERSION = 2
+
+
+class CastWriter:
+    def __init__(self, out: TextIO, width: int, height: int,
+                 clock: Callable[[], float] = time.monotonic,
+                 collapse: bool = False, max_idle: float = 1.0, merge: float = 0.1,
+                 buffer_size: int = 64 * 1024, title: Optional[str] = None,
+                 env: Optional[Dict[str, str]] = None):
+        self.out = out
+        self.clock = clock
+        self.collapse = collapse
+        self.max_idle = max_idle
+        self.merge = merge
+        self.buffer_size = buffer_size
+        self.frames = 0  # events written
+        self.collapsed = 0  # frames merged into the event before them
+
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._started = clock()
+        self._skipped = 0.0  # idle time cut out so far
+        self._last_time = 0.0  # timestamp of the last frame, after cuts
+        self._held: Optional[Tuple[float, List[str]]] = None  # event still taking merges
+
+        header = {"version": CAST_VERSION, "width": width, "height": height,
+                  "timestamp": int(time.time())}
+        if title:
+            header["title"] = title
+        header["env"] = env if env is not None else {"TERM": os.environ.get("TERM", "xterm-256color")}
+        self._add(json.dumps(header))
+
+    def _add(self, line: str):
+        self._buffer.append(line + "\n")
+        self._buffered += len(line) + 1
+        if self._buffered >= self.buffer_size:
+            self._write()
+
+    def _event(self, elapsed: float, data: str):
+        self.frames += 1
+        self._add(json.dumps([round(elapsed, 6), "o", data], ensure_ascii=False))
+
+    def _release(self):
+        """Write out the event held for merging, if any."""
+        if self._held is not None:
+            elapsed, parts = self._held
+            self._held = None
+            self._event(elapsed, "".join(parts))
+
+    def frame(self, data: str):
+        """Record one frame's output, stamped with the current clock."""
+        if not data:
+            return
+        elapsed = self.clock() - self._started - self._skipped
+        if not self.collapse:
+            self._last_time = elapsed
+            self._event(elapsed, data)
+            return
+
+        idle = elapsed - self._last_time
+        if idle > self.max_idle:
+            self._skipped += idle - self.max_idle
+            elapsed = self._last_time + self.max_idle
+        self._last_time = elapsed
+        if self._held is not None and elapsed - self._held[0] < self.merge:
+            self._held[1].append(data)
+            self.collapsed += 1
+            return
+        self._release()
+        self._held = (elapsed, [data])
+
+    def flush(self):
+        """Write out everything recorded so far."""
+        self._release()
+        self._write()
+
+    def _write(self):
+        if self._buffer:
+            self.out.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self.out.flush()
+
+    def close(self):
+        self.flush()
+        self.out.close()
+
+
+def attach(issue, out: TextIO, **options) -> CastWriter:
+    """Start casting an issue's Screen to out, on the issue's scheduler clock."""
+    canvas = issue.canvas
+    cast = CastWriter(out, canvas.width, canvas.height, clock=issue.scheduler.clock, **options)
+    canvas.cast = cast
+    # The cast starts from a blank terminal, so begin with a full frame
+    canvas.invalidate()
+    return cast
+
+
+def cast_if_requested(issue) -> Optional[CastWriter]:
+    """Cast to the file named by TINYTUIS_CAST, if set."""
+    path = os.environ.get(CAST_ENV)
+    if not path:
+        return None
+    return attach(issue, open(path, "w", encoding="utf-8"), title=type(issue).__name__)
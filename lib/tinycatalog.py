@@ -0,0 +1,163 @@
+"""
+tinycatalog - find the issues under issues/ from their manifests.
+
+Every issue directory carries an issue.json describing it:
+
+    {"number": 6, "title": "Caret Cuts", "description": "...",
+     "entry": "CaretCuts", "status": "available", "isolated": true}
+
+number, title and description are required; status defaults to
+available, main to main.py, and entry names the class in main to run.
+Issues that are announced but not written yet are a directory holding
+only a manifest with status coming_soon.
+
+Reading hundreds of manifests on every start would make the rack slower
+with every issue published, so a Catalog keeps what it read in an index
+file next to them and only re-reads a manifest whose mtime or size
+changed. The directory list is trusted too while the issues directory's
+own mtime stands still, so a start with nothing new costs one stat per
+manifest and no parsing.
+
+    catalog = Catalog("issues")
+    for issue in catalog.refresh():
+        print(issue.number, issue.title, issue.status.value)
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional
+
+
+MANIFEST = "issue.json"
+INDEX_NAME = ".index.json"
+INDEX_VERSION = 1
+
+
+class Status(str, Enum):
+    AVAILABLE = "available"
+    COMING_SOON = "coming_soon"
+    PROTOTYPE = "prototype"
+
+
+@dataclass
+class Issue:
+    number: int
+    title: str
+    description: str
+    path: str  # the issue's main program
+    status: Status = Status.AVAILABLE
+    entry: Optional[str] = None  # the class in path to run
+    isolated: bool = False  # run in a worker process, so a crash cannot take the launcher down
+
+    @property
+    def directory(self) -> str:
+        """The issue's directory name, e.g. 06-caret-cuts."""
+        return os.path.basename(os.path.dirname(self.path))
+
+
+def read_manifest(directory: str) -> Dict[str, object]:
+    """A manifest's fields, checked and with defaults filled in; ValueError if it is bad."""
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("manifest is not an object")
+    missing = [key for key in ("number", "title", "description") if key not in data]
+    if missing:
+        raise ValueError(f"manifest lacks {', '.join(missing)}")
+    status = Status(data.get("status", Status.AVAILABLE.value))
+    if status is Status.AVAILABLE and not data.get("entry"):
+        raise ValueError("available issue has no entry class")
+    return {
+        "number": int(data["number"]),
+        "title": str(data["title"]),
+        "description": str(data["description"]),
+        "main": str(data.get("main", "main.py")),
+        "status": status.value,
+        "entry": data.get("entry"),
+        "isolated": bool(data.get("isolated", False)),
+    }
+
+
+class Catalog:
+    def __init__(self, root: str, index_path: Optional[str] = None):
+        self.root = root
+        self.index_path = index_path or os.path.join(root, INDEX_NAME)
+        self.issues: List[Issue] = []
+        self.parsed = 0  # manifests read by the last refresh(); the rest came from the index
+        self.problems: List[str] = []  # manifests skipped by the last refresh(), and why
+
+    def _load_index(self) -> Dict[str, object]:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return {}
+        return index
+
+    def _save_index(self, index: Dict[str, object]):
+        # Written aside and renamed, so a reader never sees half an index;
+        # a read-only checkout just goes without
+        temp = f"{self.index_path}.{os.getpid()}"
+        try:
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(temp, self.index_path)
+        except OSError:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+
+    def _scan(self) -> List[str]:
+        """Issue directories under root, hidden and private ones left out."""
+        with os.scandir(self.root) as entries:
+            return sorted(entry.name for entry in entries
+                          if entry.is_dir() and not entry.name.startswith((".", "_")))
+
+    def refresh(self) -> List[Issue]:
+        """Bring the catalog up to date with the manifests on disk; returns the issues by number."""
+        index = self._load_index()
+        cached: Dict[str, Dict[str, object]] = index.get("issues", {})
+        root_mtime = os.stat(self.root).st_mtime_ns
+        if index.get("root_mtime") == root_mtime:
+            names = index.get("dirs", [])
+        else:
+            names = self._scan()
+
+        self.parsed = 0
+        self.problems = []
+        entries: Dict[str, Dict[str, object]] = {}
+        for name in names:
+            directory = os.path.join(self.root, name)
+            try:
+                stat = os.stat(os.path.join(directory, MANIFEST))
+            except OSError:
+                continue  # not an issue (yet)
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            entry = cached.get(name)
+            if entry is None or entry.get("stamp") != stamp:
+                try:
+                    entry = read_manifest(directory)
+                except (OSError, ValueError, TypeError) as e:
+                    self.problems.append(f"{name}: {e}")
+                    continue
+                entry["stamp"] = stamp
+                self.parsed += 1
+            entries[name] = entry
+
+        if (self.parsed or entries.keys() != cached.keys()
+                or index.get("root_mtime") != root_mtime):
+            self._save_index({"version": INDEX_VERSION, "root_mtime": root_mtime,
+                              "dirs": names, "issues": entries})
+
+        self.issues = sorted(
+            (Issue(entry["number"], entry["title"], entry["description"],
+                   os.path.join(self.root, name, entry["main"]), Status(entry["status"]),
+                   entry["entry"], entry["isolated"])
+             for name, entry in entries.items()),
+            key=lambda issue: (issue.number, issue.title))
+        return self.issues
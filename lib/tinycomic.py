@@ -0,0 +1,433 @@
+"""
+tinycomic - comics as files, read a page at a time.
+
+Gutter's first comic is three pages written out in Python; a comic with
+hundreds of pages is better kept in a file that the reader only opens,
+not loads. A comic file is a small fixed header, a table of where each
+page starts, and then the pages themselves:
+
+    offset  size        field
+    0       8           magic, b"TTCOMIC\\0"
+    8       4           format version, uint32 little-endian
+    12      4           page count N, uint32
+    16      8 * (N+1)   page offsets from the start of the file, uint64;
+                        page i is the bytes [offset i, offset i+1)
+    ...                 pages, each a UTF-8 JSON object:
+                        {"title": "TEETH", "panels": [{"x": 2, "y": 2,
+                         "width": 25, "height": 5, "content": [...],
+                         "dialogue": "..."}, ...]}
+
+A compiled bundle (compile_comic(), tools/comic.py) has the same header
+and offset table under the magic b"TTBUNDL\0", but its pages are already
+laid out in cells: each panel row is run-length encoded over a glyph
+table interned for the whole comic, PackBits style (a word with the
+high bit set repeats the next glyph that many times, any other word is
+a count of glyphs that follow as they are), and every page carries the visible
+rows of its panels for a few standard page areas. The glyph table and
+the sizes follow the last page:
+
+    u16 size count, (u16 width, u16 height) per size,
+    u32 glyph count, u32 codepoint per glyph
+
+A bundle page is, little-endian throughout:
+
+    u16 title length, title (UTF-8), u16 panel count,
+    per panel: i16 x, i16 y, u16 width, u16 height,
+               u16 dialogue length, dialogue (UTF-8),
+               u16 rows, per row u16 word count and the u16 words
+    per size: u16 visible rows per panel
+
+Rows are stored as the screen lays them out, a double-width glyph
+followed by a WIDE_TAIL cell, so decoding one turns the runs into rows
+of cells (Panel.cells) that Screen.put_cells() copies straight into its
+planes: drawing a bundled page does no encoding and, at a standard
+size, no clipping.
+
+ComicFile maps the file and reads just the header when it opens, so a
+thousand pages open as fast as three. Indexing it decodes that one page
+and queues its neighbours on a background thread, so by the time the
+reader turns the page it is already decoded. Decoded pages are kept,
+least recently read dropped first, up to cache_size of them.
+
+    write_comic("tooth-birds.comic", pages)
+    with ComicFile("tooth-birds.comic") as comic:
+        print(len(comic), comic[0].title)
+"""
+
+import dataclasses
+import json
+import mmap
+import queue
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from tinyscreen import CELL_TYPECODE, WIDE_TAIL, is_wide
+
+
+MAGIC = b"TTCOMIC\0"
+BUNDLE_MAGIC = b"TTBUNDL\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sII")
+OFFSET = struct.Struct("<Q")
+PANEL = struct.Struct("<hhHH")
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+
+REPEAT = 0x8000  # high bit of a run header: repeat the next glyph
+MAX_RUN = 0x7FFF
+MIN_REPEAT = 3  # shorter repeats are cheaper left in a literal
+
+# Gutter's page area (the terminal less three rows) on 80x24, 100x30,
+# 120x40 and 160x50 terminals
+STANDARD_SIZES = ((80, 21), (100, 27), (120, 37), (160, 47))
+
+
+@dataclass
+class Panel:
+    x: int
+    y: int
+    width: int
+    height: int
+    content: List[str]
+    dialogue: str = ""
+    highlighted: bool = False
+    cells: Optional[List[array]] = None  # content rows as cells, from a bundle
+
+    @property
+    def rows(self) -> int:
+        return len(self.cells) if self.cells is not None else len(self.content)
+
+
+class ComicPage:
+    def __init__(self, title: str, panels: List[Panel]):
+        self.title = title
+        self.panels = panels
+        self.current_panel = 0
+        self.wide = False  # True if the cells of its panels may hold double-width glyphs
+        # (width, height) of a page area -> rows of each panel inside it
+        self.layouts: Dict[Tuple[int, int], List[int]] = {}
+
+    def visible_rows(self, width: int, height: int) -> List[int]:
+        """How many rows of each panel fall inside a width x height page area."""
+        rows = self.layouts.get((width, height))
+        if rows is None:
+            # Rows above the top still count; the screen clips those itself
+            rows = self.layouts[(width, height)] = [
+                max(0, min(panel.rows, height - panel.y)) for panel in self.panels]
+        return rows
+
+
+def encode_page(page: ComicPage) -> bytes:
+    panels = [{field.name: getattr(panel, field.name) for field in dataclasses.fields(Panel)
+               if field.name not in ("highlighted", "cells")} for panel in page.panels]
+    return json.dumps({"title": page.title, "panels": panels},
+                      ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_page(data: bytes) -> ComicPage:
+    page = json.loads(data.decode("utf-8"))
+    return ComicPage(page["title"], [Panel(**panel) for panel in page["panels"]])
+
+
+def write_comic(path: str, pages: Iterable[ComicPage]):
+    """Write pages out as a comic file."""
+    _write_pages(path, MAGIC, [encode_page(page) for page in pages])
+
+
+def _write_pages(path: str, magic: bytes, blocks: List[bytes], tail: bytes = b""):
+    offset = HEADER.size + OFFSET.size * (len(blocks) + 1)
+    offsets = [offset]
+    for block in blocks:
+        offset += len(block)
+        offsets.append(offset)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(magic, FORMAT_VERSION, len(blocks)))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        for block in blocks:
+            f.write(block)
+        f.write(tail)
+
+
+def _pack_text(text: str) -> bytes:
+    data = text.encode("utf-8")
+    return U16.pack(len(data)) + data
+
+
+def encode_row(row: Sequence[int]) -> array:
+    """A row of glyph indices run-length encoded into words."""
+    words = array("H")
+    literal: List[int] = []
+
+    def flush():
+        words.append(len(literal))
+        words.extend(literal)
+        literal.clear()
+
+    i = 0
+    while i < len(row):
+        end = i + 1
+        while end < len(row) and row[end] == row[i] and end - i < MAX_RUN:
+            end += 1
+        if end - i >= MIN_REPEAT:
+            if literal:
+                flush()
+            words.extend((REPEAT | (end - i), row[i]))
+        else:
+            literal.extend(row[i:end])
+            if len(literal) >= MAX_RUN - 1:
+                flush()
+        i = end
+    if literal:
+        flush()
+    return words
+
+
+def decode_row(words: Sequence[int], glyphs: array) -> array:
+    """A row of codepoints back from its words."""
+    codepoints: List[int] = []
+    i = 0
+    while i < len(words):
+        header = words[i]
+        if header & REPEAT:
+            codepoints += [glyphs[words[i + 1]]] * (header ^ REPEAT)
+            i += 2
+        else:
+            codepoints += map(glyphs.__getitem__, words[i + 1:i + 1 + header])
+            i += 1 + header
+    return array(CELL_TYPECODE, codepoints)
+
+
+def encode_bundle_page(page: ComicPage, glyphs: Dict[str, int],
+                       sizes: Sequence[Tuple[int, int]]) -> bytes:
+    """A page's bundle block, interning its characters into glyphs as it goes."""
+    parts = [_pack_text(page.title), U16.pack(len(page.panels))]
+    for panel in page.panels:
+        parts += [PANEL.pack(panel.x, panel.y, panel.width, panel.height),
+                  _pack_text(panel.dialogue), U16.pack(len(panel.content))]
+        for line in panel.content:
+            row = []
+            for char in line:
+                row.append(glyphs.setdefault(char, len(glyphs)))
+                if is_wide(ord(char)):
+                    row.append(glyphs.setdefault(chr(WIDE_TAIL), len(glyphs)))
+            if len(glyphs) > 0x10000:
+                raise ValueError("comic uses more than 65536 distinct characters")
+            words = encode_row(row)
+            if len(words) > 0xFFFF:
+                raise ValueError("panel row is too long to encode")
+            parts += [U16.pack(len(words)), _little_endian(words)]
+    for width, height in sizes:
+        parts.append(_little_endian(array("H", page.visible_rows(width, height))))
+    return b"".join(parts)
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def decode_bundle_page(data: bytes, glyphs: array, sizes: Sequence[Tuple[int, int]],
+                       wide: bool = False) -> ComicPage:
+    """A bundle block as a page whose panels hold their rows as cells.
+
+    wide says whether glyphs holds any double-width glyph.
+    """
+    view = memoryview(data)
+    pos = 0
+
+    def text() -> str:
+        nonlocal pos
+        size, = U16.unpack_from(view, pos)
+        pos += U16.size + size
+        return bytes(view[pos - size:pos]).decode("utf-8")
+
+    title = text()
+    count, = U16.unpack_from(view, pos)
+    pos += U16.size
+    panels = []
+    for _ in range(count):
+        x, y, width, height = PANEL.unpack_from(view, pos)
+        pos += PANEL.size
+        dialogue = text()
+        rows, = U16.unpack_from(view, pos)
+        pos += U16.size
+        cells = []
+        for _ in range(rows):
+            words, = U16.unpack_from(view, pos)
+            pos += U16.size
+            cells.append(decode_row(_from_little_endian("H", view[pos:pos + 2 * words]), glyphs))
+            pos += 2 * words
+        panels.append(Panel(x, y, width, height, [], dialogue, cells=cells))
+
+    page = ComicPage(title, panels)
+    page.wide = wide
+    for size in sizes:
+        page.layouts[size] = _from_little_endian("H", view[pos:pos + 2 * count]).tolist()
+        pos += 2 * count
+    return page
+
+
+def compile_comic(path: str, pages: Iterable[ComicPage],
+                  sizes: Sequence[Tuple[int, int]] = STANDARD_SIZES):
+    """Write pages out as a bundle laid out for sizes."""
+    glyphs: Dict[str, int] = {}
+    blocks = [encode_bundle_page(page, glyphs, sizes) for page in pages]
+    tail = [U16.pack(len(sizes))] + [struct.pack("<HH", *size) for size in sizes]
+    tail += [U32.pack(len(glyphs)),
+             _little_endian(array(CELL_TYPECODE, (ord(char) for char in glyphs)))]
+    _write_pages(path, BUNDLE_MAGIC, blocks, b"".join(tail))
+
+
+class ComicFile:
+    """The pages of a comic file or bundle as a sequence, decoded as they are asked for."""
+
+    def __init__(self, path: str, cache_size: int = 16, prefetch: int = 1):
+        self.path = path
+        self.cache_size = cache_size
+        self.prefetch = prefetch  # pages either side of the one read to decode ahead
+        self._file: BinaryIO = open(path, "rb")
+        self._data: Optional[mmap.mmap] = None
+        self._read_lock = threading.Lock()  # the seek fallback shares one file position
+        self._pages: "OrderedDict[int, ComicPage]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.decoded = 0  # pages decoded so far, by either thread
+        self.sizes: List[Tuple[int, int]] = []  # page areas a bundle was laid out for
+        self._glyphs: Optional[array] = None
+        self._wide = False
+
+        try:
+            try:
+                self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass  # empty files and some filesystems cannot be mapped; read with seek instead
+            magic, version, self._count = HEADER.unpack(self._read(0, HEADER.size))
+            if magic not in (MAGIC, BUNDLE_MAGIC):
+                raise ValueError(f"{path} is not a comic file")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path} is comic format {version}, expected {FORMAT_VERSION}")
+            if magic == BUNDLE_MAGIC:
+                self._read_bundle_tail()
+        except BaseException:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "ComicFile":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read(self, offset: int, size: int) -> bytes:
+        if self._data is not None:
+            data = self._data[offset:offset + size]
+        else:
+            with self._read_lock:
+                self._file.seek(offset)
+                data = self._file.read(size)
+        if len(data) != size:
+            raise ValueError(f"{self.path} is truncated")
+        return data
+
+    @property
+    def bundle(self) -> bool:
+        return self._glyphs is not None
+
+    def _read_bundle_tail(self):
+        """The sizes and glyph table after the last page."""
+        pos, = OFFSET.unpack(self._read(HEADER.size + OFFSET.size * self._count, OFFSET.size))
+        count, = U16.unpack(self._read(pos, U16.size))
+        pos += U16.size
+        sizes = _from_little_endian("H", self._read(pos, 4 * count))
+        self.sizes = [(sizes[i], sizes[i + 1]) for i in range(0, len(sizes), 2)]
+        pos += 4 * count
+        count, = U32.unpack(self._read(pos, U32.size))
+        self._glyphs = _from_little_endian(CELL_TYPECODE, self._read(pos + U32.size, 4 * count))
+        self._wide = WIDE_TAIL in self._glyphs
+
+    def _load(self, index: int) -> ComicPage:
+        """Decode a page, or return it if it already is."""
+        with self._lock:
+            page = self._pages.get(index)
+            if page is not None:
+                self._pages.move_to_end(index)
+                return page
+        start, end = struct.unpack(
+            "<2Q", self._read(HEADER.size + OFFSET.size * index, OFFSET.size * 2))
+        data = self._read(start, end - start)
+        if self._glyphs is not None:
+            page = decode_bundle_page(data, self._glyphs, self.sizes, self._wide)
+        else:
+            page = decode_page(data)
+        with self._lock:
+            # Both threads may have decoded it; keep the first, so state
+            # stored on the page (current_panel) is not lost
+            page = self._pages.setdefault(index, page)
+            self._pages.move_to_end(index)
+            self.decoded += 1
+            while len(self._pages) > self.cache_size:
+                self._pages.popitem(last=False)
+        return page
+
+    def __getitem__(self, index: int) -> ComicPage:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("comic page out of range")
+        page = self._load(index)
+        for step in range(1, self.prefetch + 1):
+            for neighbour in (index + step, index - step):
+                if 0 <= neighbour < self._count:
+                    self._prefetch(neighbour)
+        return page
+
+    def _prefetch(self, index: int):
+        with self._lock:
+            if index in self._pages:
+                return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._prefetcher, daemon=True)
+            self._thread.start()
+        self._queue.put(index)
+
+    def _prefetcher(self):
+        while True:
+            index = self._queue.get()
+            if index is None:
+                return
+            try:
+                self._load(index)
+            except Exception:
+                # Skip the page quietly: the screen belongs to the reader,
+                # which decodes it again, and raises the error, if it turns there
+                pass
+
+    def close(self):
+        """Stop prefetching and let go of the file."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
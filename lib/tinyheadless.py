@@ -0,0 +1,171 @@
+"""
+tinyheadless - run TinyTUIs without a terminal.
+
+Every issue takes terminal_size, rng and out, so it can be built with a
+fixed size, a seeded random.Random and an in-memory sink instead of the
+real terminal. headless() does that wiring, and swaps the issue's
+FrameScheduler onto a ManualClock: nothing ever sleeps, frames run back
+to back, and simulation time advances exactly one frame per frame, so a
+seed and a size always give the same run.
+
+    issue = headless(CaretCuts, columns=120, lines=40, seed=7)
+    run_frames(issue, 600)
+    print(issue.canvas.frame_bytes, issue.profiler.summary())
+
+run_frames() plays the frame loop without any input; pass a feed to
+inject events as the frames go by. replay() plays a session recorded
+with TINYTUIS_RECORD instead. Neither goes through an issue's run(), so
+there is no intro pause and no frame pacing, only the frames; headless()
+calls the issue's start() hook itself, as drive() does.
+"""
+
+import datetime
+import os
+import random
+from collections import deque
+from typing import Callable, Iterable, List, Optional
+
+from tinyloop import frame_hooks, start_issue
+from tinyrecord import Session
+
+
+# Start time pinned on issues that print the time of day (their boot_time)
+EPOCH = datetime.datetime(2000, 1, 1)
+
+
+class ManualClock:
+    """A clock that only moves when slept on, for a FrameScheduler's clock and sleep."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            self.now += seconds
+
+
+class MemorySink:
+    """Stands in for stdout: counts what a Screen writes, and keeps it if asked."""
+
+    encoding = "utf-8"
+
+    def __init__(self, keep: bool = False):
+        self.writes = 0
+        self.chars = 0
+        self.chunks: Optional[List[str]] = [] if keep else None
+
+    def write(self, data: str) -> int:
+        self.writes += 1
+        self.chars += len(data)
+        if self.chunks is not None:
+            self.chunks.append(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def getvalue(self) -> str:
+        return "".join(self.chunks or ())
+
+
+def headless(issue_class, columns: int = 80, lines: int = 24, seed: int = 0,
+             keep_output: bool = False, start: bool = True):
+    """Build an issue for a headless run, mark it running and, unless start is False, start it."""
+    issue = issue_class(terminal_size=os.terminal_size((columns, lines)),
+                        rng=random.Random(seed), out=MemorySink(keep_output))
+    clock = ManualClock()
+    issue.scheduler.clock = clock
+    issue.scheduler.sleep = clock.sleep
+    if hasattr(issue, "boot_time"):
+        issue.boot_time = EPOCH
+    issue.running = True
+    if start:
+        start_issue(issue)
+    return issue
+
+
+def run_frames(issue, frames: int,
+               feed: Optional[Callable[[int], Iterable]] = None,
+               draw_every_frame: bool = True) -> int:
+    """Step a headless issue through frames frames; returns how many were drawn.
+
+    feed(frame) may return events to hand the issue before that frame.
+    With draw_every_frame the frame is drawn whether or not the scheduler
+    thinks it is due, which is what a benchmark wants; otherwise idle
+    frames of render-on-change issues are skipped as they would be live.
+    Stops early if the issue stops running.
+    """
+    handle_key, tick, draw = frame_hooks(issue)
+    scheduler = issue.scheduler
+    drawn = 0
+    for frame in range(frames):
+        if not issue.running:
+            break
+        if feed is not None:
+            for event in feed(frame):
+                handle_key(event)
+        if tick is not None:
+            for _ in scheduler.ticks_due():
+                tick()
+        if scheduler.frame_due() or draw_every_frame:
+            draw()
+            drawn += 1
+        # One frame of simulated time, however long that frame really took;
+        # pause() and resume() keep the scheduler's books as wait() would
+        _, idle = scheduler.pause()
+        scheduler.clock.sleep(scheduler.frame_interval)
+        if idle:
+            scheduler.resume()
+    return drawn
+
+
+def replay(issue_class, session: Session, keep_output: bool = False):
+    """Build a headless issue for a recorded session and play it; returns the issue."""
+    columns, lines = session.size
+    issue = headless(issue_class, columns, lines, session.seed, keep_output)
+    play_session(issue, session)
+    return issue
+
+
+def play_session(issue, session: Session):
+    """Play a recorded session through an issue headless() built at its size and seed.
+
+    Each event is handed over at the simulation tick it was recorded at,
+    which is what the issue's state depends on. Issues without a tick()
+    only move on input, so their events go in the batches they arrived
+    in, one batch whenever the issue has nothing left to draw. Runs until
+    the recorded end, or until the session's own quit key stops it.
+    """
+    # headless() seeded the rng with session.seed and then started the
+    # issue, the order a Recorder and drive() go in; reseeding here would
+    # undo what start() drew
+    handle_key, tick, draw = frame_hooks(issue)
+    scheduler = issue.scheduler
+    pending = deque(session.events)
+    end_tick = session.end[1]
+    drew = True
+    while issue.running and (pending or (tick is not None and scheduler.ticks < end_tick)):
+        if tick is not None:
+            while pending and pending[0].tick <= scheduler.ticks:
+                handle_key(pending.popleft().event)
+            # Ticks can come due two at a time; events recorded between
+            # them go in between them
+            for current in scheduler.ticks_due():
+                while pending and pending[0].tick <= current:
+                    handle_key(pending.popleft().event)
+                tick()
+        elif not drew:
+            frame = pending[0].frame
+            while pending and pending[0].frame == frame:
+                handle_key(pending.popleft().event)
+
+        drew = scheduler.frame_due()
+        if drew:
+            draw()
+        _, idle = scheduler.pause()
+        scheduler.clock.sleep(scheduler.tick_interval)
+        if idle:
+            scheduler.resume()
@@ -0,0 +1,593 @@
+"""
+tinyinput - non-blocking keyboard and mouse input for TinyTUIs.
+
+SimpleInput.get_key() blocks, so every issue used to park a thread on it
+and piece escape sequences together one get_key() at a time. KeyReader
+instead switches stdin to raw-ish mode once and lets the main loop poll()
+for the events that arrived since the last frame. wait() blocks on stdin
+with a timeout, which lets an idle loop sleep until a key is pressed;
+wake(), from any thread, cuts the sleep short.
+
+    with KeyReader() as keys:
+        while running:
+            for event in keys.poll():
+                handle_key(event)
+            ...
+
+Events come from an InputParser: KeyEvent for keys (arrows, SS3 and
+modified forms included), MouseEvent for clicks when the reader was
+opened with mouse=True, PasteEvent for pastes with paste=True.
+Compare against KEY_LEFT, CTRL_C and friends, or look at event.key.
+
+Where termios is missing (Windows) it falls back to a reader thread on
+tinykit's SimpleInput, behind the same interface.
+
+reading_keys() hands an issue an open reader: the launcher's own when
+it was started from the rack, or a fresh one when run on its own.
+"""
+
+import codecs
+import os
+import selectors
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+try:
+    import termios
+except ImportError:  # Windows
+    termios = None
+
+
+@dataclass(frozen=True)
+class KeyEvent:
+    """A key press. key is the character typed, or a name such as 'up' or 'f5'."""
+    key: str
+    ctrl: bool = False
+    alt: bool = False
+    shift: bool = False
+
+    @property
+    def char(self) -> str:
+        """The text this key types, or '' for named and modified keys."""
+        if len(self.key) == 1 and not (self.ctrl or self.alt):
+            return self.key
+        return ""
+
+
+@dataclass(frozen=True)
+class MouseEvent:
+    """A mouse report (SGR or legacy X10 encoding), in 0-based cells."""
+    x: int
+    y: int
+    button: Optional[str]  # left, middle, right, wheel_up, wheel_down; None for plain motion
+    action: str  # press, release, drag, move
+    ctrl: bool = False
+    alt: bool = False
+    shift: bool = False
+
+
+@dataclass(frozen=True)
+class PasteEvent:
+    """Text pasted while bracketed paste was on, delivered whole."""
+    text: str
+
+
+InputEvent = Union[KeyEvent, MouseEvent, PasteEvent]
+
+
+KEY_UP = KeyEvent("up")
+KEY_DOWN = KeyEvent("down")
+KEY_RIGHT = KeyEvent("right")
+KEY_LEFT = KeyEvent("left")
+KEY_ENTER = KeyEvent("enter")
+KEY_ESCAPE = KeyEvent("escape")
+KEY_BACKSPACE = KeyEvent("backspace")
+KEY_HOME = KeyEvent("home")
+KEY_END = KeyEvent("end")
+KEY_PAGE_UP = KeyEvent("page_up")
+KEY_PAGE_DOWN = KeyEvent("page_down")
+CTRL_C = KeyEvent("c", ctrl=True)
+
+# Escape sequences without parameters, as xterm, VTE, the Linux console
+# and friends send them. Modified forms ("\x1b[1;5A", "\x1b[3;2~") are
+# reduced to these by dropping the modifier parameter.
+KEY_SEQUENCES = {
+    "\x1b[A": "up", "\x1b[B": "down", "\x1b[C": "right", "\x1b[D": "left",
+    "\x1b[H": "home", "\x1b[F": "end", "\x1b[E": "begin", "\x1b[Z": "backtab",
+    "\x1bOA": "up", "\x1bOB": "down", "\x1bOC": "right", "\x1bOD": "left",
+    "\x1bOH": "home", "\x1bOF": "end", "\x1bOE": "begin", "\x1bOM": "enter",
+    "\x1bOP": "f1", "\x1bOQ": "f2", "\x1bOR": "f3", "\x1bOS": "f4",
+    "\x1b[1~": "home", "\x1b[2~": "insert", "\x1b[3~": "delete", "\x1b[4~": "end",
+    "\x1b[5~": "page_up", "\x1b[6~": "page_down", "\x1b[7~": "home", "\x1b[8~": "end",
+    "\x1b[11~": "f1", "\x1b[12~": "f2", "\x1b[13~": "f3", "\x1b[14~": "f4",
+    "\x1b[15~": "f5", "\x1b[17~": "f6", "\x1b[18~": "f7", "\x1b[19~": "f8",
+    "\x1b[20~": "f9", "\x1b[21~": "f10", "\x1b[23~": "f11", "\x1b[24~": "f12",
+    "\x1b[[A": "f1", "\x1b[[B": "f2", "\x1b[[C": "f3", "\x1b[[D": "f4", "\x1b[[E": "f5",
+}
+
+# C0 controls with names of their own; the rest arrive as Ctrl+letter
+CONTROL_KEYS = {
+    "\r": KEY_ENTER, "\n": KEY_ENTER, "\t": KeyEvent("tab"),
+    "\x7f": KEY_BACKSPACE, "\b": KEY_BACKSPACE,
+    "\x00": KeyEvent(" ", ctrl=True),
+}
+
+READ_SIZE = 1024
+# How long the rest of an escape sequence may take to follow its ESC
+# before the ESC counts as the Escape key
+ESC_TIMEOUT = 0.05
+
+# DEC private modes: 1000 reports clicks, 1006 encodes them as SGR
+MOUSE_MODES = (1000, 1006)
+PASTE_MODES = (2004,)
+
+PASTE_START = "\x1b[200~"
+PASTE_END = "\x1b[201~"
+
+MOUSE_BUTTONS = ("left", "middle", "right", None)
+WHEEL_BUTTONS = ("wheel_up", "wheel_down", "wheel_left", "wheel_right")
+
+# Parser states
+_GROUND, _ESCAPE, _CSI, _SS3, _PASTE, _X10 = range(6)
+
+
+def _build_trie(sequences: Dict[str, str]) -> dict:
+    """Nest sequences into dicts keyed by character; a leaf holds its KeyEvent under None."""
+    root: dict = {}
+    for sequence, name in sequences.items():
+        node = root
+        for char in sequence[1:]:  # every sequence starts with ESC
+            node = node.setdefault(char, {})
+        node[None] = KeyEvent(name)
+    return root
+
+
+def _control_key(char: str) -> KeyEvent:
+    event = CONTROL_KEYS.get(char)
+    if event is None:
+        # Ctrl+A is 0x01 ... Ctrl+Z is 0x1a; 0x1c-0x1f are Ctrl+\ ] ^ _
+        event = KeyEvent(chr(ord(char) + 96) if ord(char) <= 26 else chr(ord(char) + 64),
+                         ctrl=True)
+    return event
+
+
+def _modifiers(event: KeyEvent, code: int) -> KeyEvent:
+    """Apply an xterm modifier parameter (1 + shift|alt<<1|ctrl<<2)."""
+    bits = code - 1
+    if bits <= 0:
+        return event
+    return KeyEvent(event.key, ctrl=bool(bits & 4), alt=bool(bits & 2), shift=bool(bits & 1))
+
+
+def _mouse(code: int, x: int, y: int, release: bool) -> MouseEvent:
+    flags = dict(shift=bool(code & 4), alt=bool(code & 8), ctrl=bool(code & 16))
+    if code & 64:
+        return MouseEvent(x, y, WHEEL_BUTTONS[code & 3], "press", **flags)
+    button = MOUSE_BUTTONS[code & 3]
+    if release:
+        action = "release"
+    elif code & 32:
+        action = "drag" if button else "move"
+    else:
+        action = "press"
+    return MouseEvent(x, y, button, action, **flags)
+
+
+class InputParser:
+    """Turn terminal input into events, one character at a time.
+
+    feed() takes chunks as they arrive, bytes or text, split anywhere: a
+    sequence cut short at the end of a chunk is finished by the next one.
+    Each character is looked at once, following a trie of KEY_SEQUENCES
+    where it can and collecting CSI parameters for everything else
+    (modifiers, mouse reports, bracketed paste).
+
+    A lone ESC is indistinguishable from the start of a sequence until
+    nothing follows it, so call flush() when input has gone quiet.
+
+    With mouse=False mouse reports are dropped, and with paste=False a
+    bracketed paste comes out as the keys it is made of, so callers only
+    see the event types they asked the terminal for.
+    """
+
+    _trie = _build_trie(KEY_SEQUENCES)
+
+    def __init__(self, mouse: bool = True, paste: bool = True):
+        self.mouse = mouse
+        self.paste = paste
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._state = _GROUND
+        self._node: Optional[dict] = None  # trie position within the current sequence
+        self._sequence: List[str] = []  # characters of the sequence so far
+        self._paste: List[str] = []
+
+    @property
+    def pending(self) -> bool:
+        """Whether an unfinished sequence is held back waiting for more input."""
+        return self._state != _GROUND
+
+    def feed(self, data: Union[bytes, str]) -> List[InputEvent]:
+        """Parse a chunk of input; returns the events it completes."""
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        events: List[InputEvent] = []
+        for char in data:
+            self._step(char, events)
+        return events
+
+    def flush(self) -> List[InputEvent]:
+        """Give up waiting on an unfinished sequence and report what it was."""
+        events: List[InputEvent] = []
+        if self._state == _ESCAPE:
+            events.append(KEY_ESCAPE)
+        elif self._state in (_CSI, _SS3, _X10):
+            # Alt+[ or Alt+O followed by ordinary keys, as far as we can tell
+            rest = self._sequence[2:]
+            events.append(KeyEvent(self._sequence[1], alt=True))
+            self._reset()
+            for char in rest:
+                self._step(char, events)
+            return events + self.flush()
+        if self._state != _PASTE:
+            # A paste can take longer than one quiet spell to arrive
+            self._reset()
+        return events
+
+    def _reset(self):
+        self._state = _GROUND
+        self._node = None
+        self._sequence = []
+
+    def _step(self, char: str, events: List[InputEvent]):
+        state = self._state
+        if state == _GROUND:
+            if char == "\x1b":
+                self._state = _ESCAPE
+                self._node = self._trie
+                self._sequence = [char]
+            elif char < " " or char == "\x7f":
+                events.append(_control_key(char))
+            else:
+                events.append(KeyEvent(char))
+            return
+
+        if state == _PASTE:
+            self._paste.append(char)
+            if char == "~" and "".join(self._paste[-len(PASTE_END):]) == PASTE_END:
+                text = "".join(self._paste[:-len(PASTE_END)])
+                self._paste = []
+                self._reset()
+                if self.paste:
+                    events.append(PasteEvent(text))
+                else:
+                    for char in text:
+                        self._step(char, events)
+            return
+
+        self._sequence.append(char)
+
+        if state == _X10:
+            # Legacy mouse report: three bytes, each offset by 32
+            if len(self._sequence) == 6:
+                code, x, y = (ord(c) - 32 for c in self._sequence[3:])
+                if self.mouse:
+                    events.append(_mouse(code, x - 1, y - 1, release=code & 3 == 3 and not code & 96))
+                self._reset()
+            return
+
+        node = self._node.get(char) if self._node is not None else None
+        self._node = node
+        if node is not None:
+            if len(node) == 1 and None in node:
+                # A known sequence, and no longer one shares its prefix
+                events.append(node[None])
+                self._reset()
+            elif state == _ESCAPE:
+                self._state = _CSI if char == "[" else _SS3
+            return
+
+        if char == "\x1b":
+            # A new sequence cuts off the one in progress
+            if state == _ESCAPE:
+                events.append(KEY_ESCAPE)
+            self._reset()
+            self._step(char, events)
+        elif state == _ESCAPE:
+            event = _control_key(char) if char < " " or char == "\x7f" else KeyEvent(char)
+            events.append(KeyEvent(event.key, ctrl=event.ctrl, alt=True))
+            self._reset()
+        elif state == _SS3:
+            # SS3 carries at most a modifier digit before its final letter
+            if not char.isdigit():
+                self._finish_ss3(events)
+        elif "@" <= char <= "~":
+            self._finish_csi(events)
+        elif not " " <= char <= "?":
+            # Not a parameter or intermediate byte: garbage, drop the sequence
+            self._reset()
+
+    def _finish_ss3(self, events: List[InputEvent]):
+        sequence = self._sequence
+        final = sequence[-1]
+        event = self._known("\x1bO" + final)
+        if event is not None and len(sequence) > 3:
+            event = _modifiers(event, int("".join(sequence[2:-1])))
+        if event is not None:
+            events.append(event)
+        self._reset()
+
+    def _finish_csi(self, events: List[InputEvent]):
+        sequence = "".join(self._sequence)
+        params, final = sequence[2:-1], sequence[-1]
+        self._reset()
+
+        if final == "~" and sequence == PASTE_START:
+            self._state = _PASTE
+            return
+        if final == "M" and not params:
+            self._state = _X10
+            self._sequence = list(sequence)
+            return
+        if params.startswith("<") and final in "Mm":
+            fields = params[1:].split(";")
+            if self.mouse and len(fields) == 3 and all(f.isdigit() for f in fields):
+                code, x, y = map(int, fields)
+                events.append(_mouse(code, x - 1, y - 1, release=final == "m"))
+            return
+
+        fields = params.split(";")
+        if not all(f.isdigit() for f in fields if f):
+            return  # private or malformed sequence; nothing we understand
+        if final == "~":
+            event = self._known("\x1b[" + fields[0] + "~")
+        elif len(fields) > 2:
+            event = None
+        else:
+            event = self._known("\x1b[" + final)
+        if event is not None and len(fields) == 2 and fields[1]:
+            event = _modifiers(event, int(fields[1]))
+        if event is not None:
+            events.append(event)
+
+    def _known(self, sequence: str) -> Optional[KeyEvent]:
+        name = KEY_SEQUENCES.get(sequence)
+        return None if name is None else KeyEvent(name)
+
+
+class KeyReader:
+    def __init__(self, stream: Optional[TextIO] = None,
+                 mouse: bool = False, paste: bool = False):
+        self.stream = stream or sys.stdin
+        self.closed = False  # stdin hit end of file
+        self._fd: Optional[int] = None
+        self._saved_mode = None
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._parser = InputParser(mouse=mouse, paste=paste)
+        self._partial_at = 0.0  # when the parser last took input it left unfinished
+
+        # Self-pipe that wake() writes to, watched alongside stdin
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+
+        # Terminal reports to switch on while open: clicks in SGR
+        # encoding (any size of screen) and bracketed paste
+        self._modes = ((MOUSE_MODES if mouse else ()) +
+                       (PASTE_MODES if paste else ()))
+
+        # Thread fallback for platforms without termios
+        self._thread_keys: Optional[List[str]] = None
+        self._thread_lock = threading.Lock()
+        self._thread_ready = threading.Event()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        """Put the terminal in raw-ish mode and start watching stdin."""
+        if termios is None:
+            self._start_thread()
+            return
+
+        self._fd = self.stream.fileno()
+        if os.isatty(self._fd):
+            self._saved_mode = termios.tcgetattr(self._fd)
+            mode = termios.tcgetattr(self._fd)
+            # Keys arrive one by one, unechoed, and Ctrl+C comes through as '\x03'
+            mode[0] &= ~(termios.ICRNL | termios.IXON)
+            mode[3] &= ~(termios.ICANON | termios.ECHO | termios.ISIG | termios.IEXTEN)
+            mode[6][termios.VMIN] = 1
+            mode[6][termios.VTIME] = 0
+            termios.tcsetattr(self._fd, termios.TCSANOW, mode)
+            self._set_modes("h")
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._fd, selectors.EVENT_READ)
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+
+    def close(self):
+        """Give the terminal back the way we found it."""
+        if self._saved_mode is not None:
+            self._set_modes("l")
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved_mode)
+            self._saved_mode = None
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self._wake_w is not None:
+            wake_r, wake_w = self._wake_r, self._wake_w
+            self._wake_r = self._wake_w = None
+            os.close(wake_r)
+            os.close(wake_w)
+
+    def configure(self, mouse: bool = False, paste: bool = False):
+        """Switch mouse and paste reporting, on an open reader too."""
+        if self._saved_mode is not None:
+            self._set_modes("l")
+        self._parser.mouse = mouse
+        self._parser.paste = paste
+        self._modes = ((MOUSE_MODES if mouse else ()) +
+                       (PASTE_MODES if paste else ()))
+        if self._saved_mode is not None:
+            self._set_modes("h")
+
+    def reclaim(self):
+        """Take the terminal back from a child that may have died with its reporting on."""
+        if self._saved_mode is not None:
+            sys.stdout.write("".join(f"\x1b[?{mode}l" for mode in MOUSE_MODES + PASTE_MODES))
+            self._set_modes("h")
+            sys.stdout.flush()
+
+    @property
+    def reporting(self) -> Tuple[bool, bool]:
+        """(mouse, paste) as set at construction or by configure()."""
+        return self._parser.mouse, self._parser.paste
+
+    def _set_modes(self, action: str):
+        if self._modes:
+            sys.stdout.write("".join(f"\x1b[?{mode}{action}" for mode in self._modes))
+            sys.stdout.flush()
+
+    def fileno(self) -> Optional[int]:
+        """The descriptor keys are read from, or None for the thread fallback."""
+        return None if self._thread_keys is not None else self._fd
+
+    def _start_thread(self):
+        from tinykit import SimpleInput
+
+        self._thread_keys = []
+
+        def read_keys():
+            while True:
+                key = SimpleInput.get_key()
+                with self._thread_lock:
+                    self._thread_keys.append(key)
+                self._thread_ready.set()
+
+        threading.Thread(target=read_keys, daemon=True).start()
+
+    def wake(self):
+        """End a wait() in progress, or the next one, early; safe from any thread."""
+        if self._thread_keys is not None:
+            self._thread_ready.set()
+            return
+        wake_w = self._wake_w
+        if wake_w is not None:
+            try:
+                os.write(wake_w, b"\0")
+            except OSError:
+                pass  # the pipe is full, so a wake is pending anyway, or we just closed
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until input is ready, wake() is called or timeout seconds pass; True if input is ready."""
+        if self._thread_keys is not None:
+            return self._thread_ready.wait(timeout)
+
+        if self._selector is None or self.closed:
+            if timeout:
+                time.sleep(timeout)
+            return False
+        ready = False
+        for key, _ in self._selector.select(timeout):
+            if key.fd == self._wake_r:
+                try:
+                    while os.read(self._wake_r, READ_SIZE):
+                        pass
+                except BlockingIOError:
+                    pass
+            else:
+                ready = True
+        return ready
+
+    def _read(self, timeout: float) -> List[InputEvent]:
+        """Parse everything stdin has for us, waiting up to timeout for the first of it."""
+        events: List[InputEvent] = []
+        if self._thread_keys is not None:
+            if self.wait(timeout):
+                with self._thread_lock:
+                    if self._thread_keys:
+                        events = self._parser.feed("".join(self._thread_keys))
+                        self._partial_at = time.monotonic()
+                    self._thread_keys.clear()
+                    self._thread_ready.clear()
+            return events
+
+        while self.wait(timeout):
+            data = os.read(self._fd, READ_SIZE)
+            if not data:
+                self.closed = True
+                break
+            events += self._parser.feed(data)
+            self._partial_at = time.monotonic()
+            timeout = 0
+        return events
+
+    def read_ready(self) -> List[InputEvent]:
+        """Events from the input already waiting, never blocking.
+
+        Unlike poll() it leaves a lone ESC pending rather than waiting out
+        ESC_TIMEOUT for the rest of a sequence; call expire() once
+        expires_in() has passed to settle it. For event loops that must
+        not block.
+        """
+        return self._read(0)
+
+    def expires_in(self) -> Optional[float]:
+        """Seconds until a held-back sequence counts as finished, or None if there is none."""
+        if not self._parser.pending:
+            return None
+        return max(0.0, self._partial_at + ESC_TIMEOUT - time.monotonic())
+
+    def expire(self) -> List[InputEvent]:
+        """Report a held-back sequence, if ESC_TIMEOUT has passed without the rest of it."""
+        if self.expires_in() != 0.0:
+            return []
+        events = self._parser.flush()
+        # A paste still arriving stays pending; give it another spell
+        self._partial_at = time.monotonic()
+        return events
+
+    def poll(self, timeout: Optional[float] = 0.0) -> List[InputEvent]:
+        """Events since the last poll, waiting up to timeout (None: forever) for input."""
+        events = self._read(timeout)
+        while self._parser.pending:
+            # Wait out the rest of the sequence here rather than until the
+            # next poll, which may block until the next key and would then
+            # read that key as Alt+key
+            if not self.wait(ESC_TIMEOUT):
+                # A lone ESC, or a report cut short
+                events += self._parser.flush()
+                break
+            events += self._read(0)
+        return events
+
+
+@contextmanager
+def reading_keys(keys: Optional[KeyReader] = None,
+                 mouse: bool = False, paste: bool = False) -> Iterator[KeyReader]:
+    """An open KeyReader with the given reports on, for the length of the block.
+
+    Pass the reader of whoever launched us (the rack) and it is borrowed:
+    reconfigured for the block and set back after, never closed. Without
+    one a new reader is opened and closed again.
+    """
+    if keys is None:
+        with KeyReader(mouse=mouse, paste=paste) as keys:
+            yield keys
+        return
+
+    previous = keys.reporting
+    keys.configure(mouse=mouse, paste=paste)
+    try:
+        yield keys
+    finally:
+        keys.configure(*previous)
@@ -0,0 +1,174 @@
+"""
+tinylaunch - run issues inside a process that is already up.
+
+Starting an issue with subprocess pays for a new interpreter, the tinykit
+import and the issue's own import every time, and drops the terminal out
+of the launcher's input mode and back. load_issue() instead imports an
+issue's main.py once, under a module name of its own, and keeps its
+class; launch() builds a fresh instance from it and runs it on the
+caller's KeyReader, so the next launch only pays for __init__.
+
+    with KeyReader() as keys:
+        launch("issues/06-caret-cuts/main.py", "CaretCuts", keys)
+
+Issues that should not be able to take the launcher down with them run
+in a WorkerPool instead: a few processes forked ahead of time from the
+launcher, with tinykit and the issue modules already imported, each
+waiting on a pipe for one issue to run. Launching hands a worker the
+terminal and waits for it to exit, while a replacement is forked in
+its place, so there is a warm worker ready for the next launch. Workers
+that die while waiting are reaped and replaced at the next launch.
+Workers need os.fork, so POSIX only.
+
+Forking copies the locks other threads hold, but not the threads, so the
+pool only forks while the launcher has no other thread running (an
+in-process issue's prefetcher, say). With no warm worker and a thread
+about, the issue is started in a fresh interpreter instead.
+"""
+
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+import threading
+import traceback
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tinyinput import KeyReader
+
+
+# (absolute path, class name) -> issue class
+_classes: Dict[Tuple[str, str], type] = {}
+
+
+def module_name(path: str) -> str:
+    """A module name for an issue's main.py, after its directory: issue_06_caret_cuts."""
+    directory = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    return "issue_" + re.sub(r"\W", "_", directory)
+
+
+def load_issue(path: str, class_name: str) -> type:
+    """An issue's class, importing its module the first time it is asked for."""
+    key = (os.path.abspath(path), class_name)
+    cls = _classes.get(key)
+    if cls is None:
+        name = module_name(path)
+        spec = importlib.util.spec_from_file_location(name, key[0])
+        module = importlib.util.module_from_spec(spec)
+        # Registered before running it, as import does, so dataclasses and
+        # pickling can find the module by name
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        cls = _classes[key] = getattr(module, class_name)
+    return cls
+
+
+def launch(path: str, class_name: str, keys: Optional[KeyReader] = None):
+    """Run a fresh instance of an issue until it quits; returns the instance."""
+    issue = load_issue(path, class_name)()
+    issue.run(keys=keys)
+    return issue
+
+
+def exit_code(status: int) -> int:
+    """A waitpid() status as an exit code, negative for a signal (os.waitstatus_to_exitcode)."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def other_threads() -> bool:
+    """Whether any thread but this one is running, which makes forking unsafe."""
+    return threading.active_count() > 1
+
+
+class WorkerPool:
+    """Pre-forked workers, each waiting to run one issue in a process of its own."""
+
+    def __init__(self, size: int = 1, preload: Iterable[Tuple[str, str]] = ()):
+        self.size = size
+        # Import before forking, so every worker starts with them loaded
+        for path, class_name in preload:
+            load_issue(path, class_name)
+        self._idle: List[Tuple[int, int]] = []  # (pid, job pipe) of waiting workers
+        self.fill()
+
+    def fill(self):
+        """Fork workers until size of them are waiting, unless another thread is running."""
+        self._reap()
+        while len(self._idle) < self.size and not other_threads():
+            self._idle.append(self._spawn())
+
+    def _reap(self):
+        """Drop the waiting workers that have died, and their pipes."""
+        alive = []
+        for pid, fd in self._idle:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            if done:
+                os.close(fd)
+            else:
+                alive.append((pid, fd))
+        self._idle = alive
+
+    def _spawn(self) -> Tuple[int, int]:
+        read_fd, write_fd = os.pipe()
+        # Unflushed output would be written twice, once by each process
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            os.close(write_fd)
+            for _, fd in self._idle:
+                os.close(fd)
+            self._serve(read_fd)
+        os.close(read_fd)
+        return pid, write_fd
+
+    @staticmethod
+    def _serve(read_fd: int):
+        """Worker side: run the one issue sent down the pipe, then exit."""
+        status = 0
+        try:
+            with os.fdopen(read_fd) as jobs:
+                job = jobs.readline()
+            if job:  # empty when the pool closed without a job for us
+                path, class_name = job.rstrip("\n").split("\t")
+                launch(path, class_name)
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            # Skip the launcher's cleanup (its finally blocks, atexit), which is not ours to run
+            os._exit(status)
+
+    def launch(self, path: str, class_name: str) -> int:
+        """Run an issue in a warm worker until it quits; returns the worker's exit code."""
+        self._reap()
+        if self._idle:
+            pid, fd = self._idle.pop(0)
+        elif not other_threads():
+            pid, fd = self._spawn()
+        else:
+            # Nothing warm, and no safe fork: the issue's own entry point, cold
+            return subprocess.call([sys.executable, path])
+        os.write(fd, f"{path}\t{class_name}\n".encode())
+        os.close(fd)
+        # The replacement warms up while the issue runs
+        self.fill()
+        _, status = os.waitpid(pid, 0)
+        return exit_code(status)
+
+    def close(self):
+        """Let the waiting workers go and reap them."""
+        for pid, fd in self._idle:
+            os.close(fd)
+        for pid, _ in self._idle:
+            os.waitpid(pid, 0)
+        self._idle.clear()
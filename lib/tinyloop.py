@@ -0,0 +1,295 @@
+"""
+tinyloop - frame pacing for TinyTUIs.
+
+A FrameScheduler separates simulation from drawing: the simulation
+advances in fixed ticks on its own clock, so a snowflake falls at the
+same speed however long a frame takes to draw, while frames are paced to
+a target rate and dropped when the machine falls behind.
+
+    scheduler = FrameScheduler(fps=20)
+    while running:
+        for _ in scheduler.ticks_due():
+            tick()
+        if scheduler.frame_due():
+            draw()
+        scheduler.wait()
+
+Issues that only change on input or at known moments (a comic page, a
+blinking cursor) can pass on_change=True instead. Frames are then drawn
+only after mark_dirty() or when a deadline set with wake_at() passes,
+and wait() blocks until one of those happens rather than spinning.
+Pass wait() the issue's KeyReader and a keypress ends the block too.
+Loops that sleep some other way register a wake hook with add_waker(),
+which mark_dirty() calls from whatever thread it runs on.
+
+drive() runs that loop for an issue, timing each part of the frame on
+the issue's FrameProfiler and recording the session or a cast of it if
+asked (see tinyrecord, tinycast); tinyasync.drive() is its asyncio twin.
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from tinyprof import PROFILE_KEY, FrameProfiler, dump_if_requested
+from tinycast import cast_if_requested
+from tinyrecord import record_if_requested
+
+
+class FrameScheduler:
+    def __init__(self, fps: float = 20.0, tick_rate: Optional[float] = None,
+                 max_catchup: int = 5, on_change: bool = False,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.frame_interval = 1.0 / fps
+        self.tick_interval = 1.0 / (tick_rate or fps)
+        # Most ticks run, or frames dropped, in a row before giving up on lost time
+        self.max_catchup = max_catchup
+        self.on_change = on_change
+        self.clock = clock
+        self.sleep = sleep
+
+        self.ticks = 0
+        self.frames = 0
+        self.dropped_frames = 0
+
+        self._last: Optional[float] = None  # clock reading at the last ticks_due()
+        self._lag = 0.0  # real time not yet simulated
+        self._idle = 0.0  # time spent blocked on purpose, exempt from the catch-up cap
+        self._blocked_at: Optional[float] = None  # start of the current idle wait
+        self._deadline: Optional[float] = None  # when the current frame is due
+        self._skipped = 0  # frames dropped in a row
+
+        # Render-on-change state; mark_dirty() may be called from an input thread
+        self._dirty = True
+        self._wake: Optional[float] = None  # clock reading to wake and redraw at
+        self._event = threading.Event()
+        self._wakers: List[Callable[[], None]] = []
+
+    @property
+    def time(self) -> float:
+        """Simulation clock in seconds: ticks run so far times the tick length."""
+        return self.ticks * self.tick_interval
+
+    def reset(self):
+        """Start pacing afresh, e.g. after a pause the simulation should not make up."""
+        self._last = None
+        self._lag = 0.0
+        self._idle = 0.0
+        self._deadline = None
+        self._skipped = 0
+
+    def mark_dirty(self):
+        """Ask for a frame; wakes a blocked wait() and calls the wake hooks."""
+        self._dirty = True
+        self._event.set()
+        for wake in list(self._wakers):
+            wake()
+
+    def add_waker(self, wake: Callable[[], None]):
+        """Have mark_dirty() call wake, on its own thread, to end an idle wait elsewhere."""
+        self._wakers.append(wake)
+
+    def remove_waker(self, wake: Callable[[], None]):
+        self._wakers.remove(wake)
+
+    def wake_at(self, sim_time: float):
+        """Redraw once the tick at or after sim_time has run (render-on-change mode)."""
+        tick = math.ceil(sim_time / self.tick_interval - 1e-9)
+        # Tick n is handed out once n + 1 ticks' worth of time has passed
+        delay = (max(tick, self.ticks) + 1 - self.ticks) * self.tick_interval - self._lag
+        wake = (self._last if self._last is not None else self.clock()) + delay
+        if self._wake is None or wake < self._wake:
+            self._wake = wake
+
+    def ticks_due(self) -> Iterator[int]:
+        """Yield once per fixed tick owed since the last call, at most max_catchup."""
+        now = self.clock()
+        if self._last is None:
+            self._last = now
+        self._lag += now - self._last
+        self._last = now
+
+        due = int(self._lag / self.tick_interval)
+        limit = self.max_catchup + int(self._idle / self.tick_interval)
+        self._idle = 0.0
+        if due > limit:
+            # Too far behind to catch up; let the simulation run slow
+            # rather than spiral into ever longer bursts of ticks
+            due = limit
+            self._lag = 0.0
+        else:
+            self._lag -= due * self.tick_interval
+
+        for _ in range(due):
+            yield self.ticks
+            self.ticks += 1
+
+    def frame_due(self) -> bool:
+        """Whether to draw this frame; False drops it because we are running late."""
+        now = self.clock()
+        if self._deadline is None:
+            self._deadline = now
+        if self.on_change:
+            # Cleared before _dirty is read, so a mark_dirty() from here on is
+            # seen by the next wait()
+            self._event.clear()
+            if self._wake is not None and now >= self._wake:
+                self._wake = None
+                self._dirty = True
+            if not self._dirty:
+                return False
+            self._dirty = False
+        elif now - self._deadline >= self.frame_interval and self._skipped < self.max_catchup:
+            self._skipped += 1
+            self.dropped_frames += 1
+            return False
+        self._skipped = 0
+        self.frames += 1
+        return True
+
+    def pause(self) -> Tuple[Optional[float], bool]:
+        """How long to sleep before the next frame, and whether it is an idle wait.
+
+        An idle wait (on_change mode, nothing to draw) has no fixed length:
+        input or mark_dirty() should cut it short, and resume() must be
+        called once it ends. None means sleep until something happens.
+        """
+        now = self.clock()
+        if self._deadline is None:
+            self._deadline = now
+        self._deadline += self.frame_interval
+
+        if self.on_change and not self._dirty:
+            self._blocked_at = now
+            return (None if self._wake is None else max(0.0, self._wake - now)), True
+
+        if now - self._deadline > self.frame_interval * self.max_catchup:
+            # Hopelessly behind (a stall, a suspended terminal): resync
+            self._deadline = now
+        return max(0.0, self._deadline - now), False
+
+    def resume(self):
+        """Note the end of an idle wait started by pause()."""
+        if self._blocked_at is None:
+            return
+        after = self.clock()
+        self._idle += after - self._blocked_at
+        self._blocked_at = None
+        # Whatever woke us gets drawn straight away
+        self._deadline = after
+
+    def wait(self, keys=None):
+        """Sleep until the next frame is due, or in on_change mode until there is one to draw.
+
+        keys is an optional KeyReader; in on_change mode input waiting on it
+        ends the sleep so the loop can handle it, as does mark_dirty().
+        """
+        delay, idle = self.pause()
+        if not idle:
+            if delay > 0:
+                self.sleep(delay)
+            return
+
+        if keys is not None:
+            self.add_waker(keys.wake)
+            try:
+                if not self._event.is_set():
+                    keys.wait(delay)
+            finally:
+                self.remove_waker(keys.wake)
+        else:
+            self._event.wait(delay)
+        self._event.clear()
+        self.resume()
+
+
+def frame_hooks(issue) -> Tuple[Callable, Optional[Callable], Callable]:
+    """handle_key, tick and draw for an issue, profiled, with the overlay toggle wired in.
+
+    Relies on the shape every issue shares: running, scheduler, canvas,
+    handle_key(), an optional tick() and render_frame() (render_page()
+    for Gutter). An optional entity_count() feeds the overlay.
+    """
+    profiler = getattr(issue, "profiler", None) or FrameProfiler()
+    render = getattr(issue, "render_frame", None) or issue.render_page
+    issue_tick = getattr(issue, "tick", None)
+    entity_count = getattr(issue, "entity_count", None)
+
+    def handle_key(event):
+        if event == PROFILE_KEY:
+            profiler.visible = not profiler.visible
+            issue.scheduler.mark_dirty()
+            return
+        with profiler.section("input"):
+            issue.handle_key(event)
+
+    def tick():
+        with profiler.section("update"):
+            issue_tick()
+
+    def draw():
+        with profiler.section("render"):
+            render()
+            if profiler.visible:
+                profiler.draw(issue.canvas)
+        issue.canvas.present()
+        profiler.end_frame(issue.canvas.frame_bytes, entity_count() if entity_count else 0)
+
+    return handle_key, (tick if issue_tick is not None else None), draw
+
+
+def start_issue(issue):
+    """Run an issue's optional start() hook.
+
+    start() is setup that draws on the issue's rng (Echo Chamber's welcome
+    echoes), so it runs once the rng is seeded for the session: in drive()
+    after a Recorder reseeds it, or in tinyheadless.headless().
+    """
+    start = getattr(issue, "start", None)
+    if start is not None:
+        start()
+
+
+def drive(issue, keys):
+    """Play an issue's interactive part until it stops running.
+
+    keys is the issue's open KeyReader. If TINYTUIS_PROFILE is set, the
+    profile is dumped there on the way out; if TINYTUIS_RECORD is, the
+    session is recorded there, and TINYTUIS_CAST names a cast to write.
+    """
+    handle_key, tick, draw = frame_hooks(issue)
+    scheduler = issue.scheduler
+    recorder = record_if_requested(issue)
+    if recorder is not None:
+        handle_key = recorder.hook(handle_key)
+    cast = cast_if_requested(issue)
+    start_issue(issue)
+    try:
+        while issue.running:
+            # Handle input
+            for event in keys.poll():
+                handle_key(event)
+
+            # Update simulation
+            if tick is not None:
+                for _ in scheduler.ticks_due():
+                    tick()
+
+            # Render frame, unless we are running behind or nothing changed
+            if scheduler.frame_due():
+                draw()
+
+            # A quit key stops the issue without scheduling anything, so
+            # waiting now would block until the next keypress
+            if not issue.running:
+                break
+            scheduler.wait(keys)
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if cast is not None:
+            cast.close()
+        if getattr(issue, "profiler", None) is not None:
+            dump_if_requested(issue.profiler)
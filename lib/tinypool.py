@@ -0,0 +1,96 @@
+"""
+tinypool - slotted entities and object reuse for TinyTUIs.
+
+Falling fragments, echoes, log lines and symbols are made and dropped
+all the time, and every one used to be a fresh object with its own
+__dict__, thrown away by a list comprehension a few seconds later. That
+churn is what the cyclic GC ends up walking mid-frame.
+
+slotted() gives a dataclass __slots__ (what dataclass(slots=True) does
+on Python 3.10+), so entities are smaller and quicker to touch. A Pool
+keeps a free list of released entities and re-initialises one when a
+new entity is wanted, instead of allocating:
+
+    @slotted
+    @dataclass
+    class Echo:
+        text: str
+        age: int = 0
+
+    echoes = Pool(Echo)
+    live = [echoes.acquire("hello")]
+    ...
+    echoes.sweep(live, lambda echo: echo.age < 50)
+
+Only release objects nothing else still refers to: the next acquire()
+hands the same object out again.
+"""
+
+import dataclasses
+from typing import Callable, Generic, Iterable, List, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """Rebuild a dataclass with __slots__ for its fields."""
+    names = tuple(field.name for field in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    # Defaults live on in the generated __init__; as class attributes they
+    # would clash with the slots of the same name
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+class Pool(Generic[T]):
+    def __init__(self, cls: Type[T], limit: int = 1024):
+        self.cls = cls
+        self.limit = limit  # most free objects to hold on to
+        self._free: List[T] = []
+
+        # How many acquire() calls allocated, and how many reused
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def acquire(self, *args, **kwargs) -> T:
+        """A freshly initialised object, recycled when one is free."""
+        if self._free:
+            obj = self._free.pop()
+            obj.__init__(*args, **kwargs)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, obj: T):
+        """Hand an object back for reuse."""
+        if len(self._free) < self.limit:
+            self._free.append(obj)
+
+    def release_all(self, objs: Iterable[T]):
+        for obj in objs:
+            self.release(obj)
+
+    def sweep(self, items: List[T], keep: Callable[[T], bool]) -> int:
+        """Drop the items keep() rejects, in place and in order, releasing them.
+
+        Returns how many were dropped. Unlike filtering into a new list,
+        this allocates nothing.
+        """
+        write = 0
+        for item in items:
+            if keep(item):
+                items[write] = item
+                write += 1
+            else:
+                self.release(item)
+        dropped = len(items) - write
+        del items[write:]
+        return dropped
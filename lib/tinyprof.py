@@ -0,0 +1,159 @@
+"""
+tinyprof - frame-time profiling for TinyTUIs.
+
+A FrameProfiler times named sections of each frame (update, render, the
+diff build, the terminal write, anything an issue wraps itself) with
+perf_counter_ns and keeps the last few hundred frames in ring buffers,
+so it costs the same after an hour as after a second.
+
+    with profiler.section("update"):
+        tick()
+    ...
+    profiler.end_frame(bytes_written=canvas.frame_bytes, entities=len(flakes))
+
+Sections may nest; a frame's total is the time spent in its outermost
+sections, so waiting between frames is never counted.
+
+Pressing F2 in an issue toggles an overlay row with p50/p99 frame time,
+bytes written and entity counts. Set TINYTUIS_PROFILE to a file name
+and the samples are dumped there as JSON when the issue exits.
+"""
+
+import json
+import os
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from tinyinput import KeyEvent
+
+
+PROFILE_KEY = KeyEvent("f2")
+PROFILE_ENV = "TINYTUIS_PROFILE"
+
+
+def percentile(samples: List[int], fraction: float) -> int:
+    """Nearest-rank percentile of samples; 0 when there are none."""
+    if not samples:
+        return 0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class FrameProfiler:
+    def __init__(self, capacity: int = 512, clock: Callable[[], int] = time.perf_counter_ns):
+        self.capacity = capacity
+        self.clock = clock
+        self.visible = False  # overlay shown
+        self.frames = 0  # frames recorded so far, including ones since overwritten
+
+        # Ring buffers, one slot per frame; slot frames % capacity is next
+        self._frame_ns = self._ring()
+        self._bytes = self._ring()
+        self._entities = self._ring()
+        self._sections: Dict[str, array] = {}
+
+        # The frame being recorded
+        self._pending: Dict[str, int] = {}
+        self._pending_total = 0
+        self._depth = 0
+
+    def _ring(self) -> array:
+        return array("q", [0]) * self.capacity
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Time the enclosed block under name, adding to this frame's total."""
+        self._depth += 1
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            self._depth -= 1
+            self._pending[name] = self._pending.get(name, 0) + elapsed
+            if not self._depth:
+                self._pending_total += elapsed
+
+    def end_frame(self, bytes_written: int = 0, entities: int = 0):
+        """Close the frame, storing everything timed since the last end_frame()."""
+        slot = self.frames % self.capacity
+        self._frame_ns[slot] = self._pending_total
+        self._bytes[slot] = bytes_written
+        self._entities[slot] = entities
+        for name, ring in self._sections.items():
+            ring[slot] = self._pending.pop(name, 0)
+        for name, elapsed in self._pending.items():
+            # A section seen for the first time; earlier frames spent nothing in it
+            ring = self._sections[name] = self._ring()
+            ring[slot] = elapsed
+        self._pending.clear()
+        self._pending_total = 0
+        self.frames += 1
+
+    def _samples(self, ring: array) -> List[int]:
+        """A ring's recorded values, oldest first."""
+        if self.frames < self.capacity:
+            return ring[:self.frames].tolist()
+        slot = self.frames % self.capacity
+        return ring[slot:].tolist() + ring[:slot].tolist()
+
+    def samples(self, name: Optional[str] = None) -> List[int]:
+        """Nanoseconds per recorded frame, in total or for one section."""
+        if name is None:
+            return self._samples(self._frame_ns)
+        ring = self._sections.get(name)
+        return self._samples(ring) if ring is not None else []
+
+    def summary(self) -> Dict[str, object]:
+        """p50/p99 in milliseconds for the frame and every section, plus output and entity averages."""
+        def stats(samples: List[int]) -> Dict[str, float]:
+            return {"p50_ms": percentile(samples, 0.5) / 1e6,
+                    "p99_ms": percentile(samples, 0.99) / 1e6}
+
+        written = self._samples(self._bytes)
+        entities = self._samples(self._entities)
+        return {
+            "frames": self.frames,
+            "frame": stats(self.samples()),
+            "sections": {name: stats(self.samples(name)) for name in self._sections},
+            "bytes_per_frame": sum(written) / len(written) if written else 0,
+            "entities": entities[-1] if entities else 0,
+        }
+
+    def overlay(self) -> str:
+        """One line for the overlay row."""
+        frame = self.samples()
+        written = self._samples(self._bytes)
+        entities = self._samples(self._entities)
+        return (f" frame p50 {percentile(frame, 0.5) / 1e6:.2f}ms"
+                f"  p99 {percentile(frame, 0.99) / 1e6:.2f}ms"
+                f"  | {written[-1] if written else 0} B"
+                f"  | {entities[-1] if entities else 0} entities"
+                f"  | F2 hides ")
+
+    def draw(self, screen, row: Optional[int] = None):
+        """Paint the overlay over a row of the frame (the last one by default)."""
+        if row is None:
+            row = screen.height - 1
+        screen.put_text(0, row, self.overlay().ljust(screen.width), screen.theme.accent)
+
+    def dump(self, path: str):
+        """Write the summary and every retained sample to path as JSON."""
+        report = {
+            "summary": self.summary(),
+            "frame_ns": self.samples(),
+            "bytes": self._samples(self._bytes),
+            "entities": self._samples(self._entities),
+            "sections_ns": {name: self.samples(name) for name in self._sections},
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=1)
+
+
+def dump_if_requested(profiler: FrameProfiler):
+    """Dump to the file named by TINYTUIS_PROFILE, if set."""
+    path = os.environ.get(PROFILE_ENV)
+    if path:
+        profiler.dump(path)
@@ -0,0 +1,147 @@
+"""
+tinyrecord - record TinyTUIs sessions for replay.
+
+Set TINYTUIS_RECORD to a file name and an issue writes its session
+there: the RNG seed, the terminal size and every input event, each
+stamped with when it arrived. tinyheadless.replay() plays the file back
+without a terminal, as fast as the machine goes, and since the issue
+sees the same seed and the same events at the same simulation ticks it
+ends up in the same state - the frame that spiked for a reader spikes
+again on the bench.
+
+A session is JSON lines, so it is small and readable:
+
+    {"tinytuis":1,"issue":"06-caret-cuts","class":"CaretCuts","seed":1234,"size":[120,40]}
+    [1532,15,15,"m",20,8,"left","press"]
+    [2870,28,28,"k","q"]
+    {"end":[2871,28,29]}
+
+Each event is [ms since start, tick, frame, kind, fields...], kind being
+k, m or p for KeyEvent, MouseEvent and PasteEvent, with fields left at
+their defaults dropped from the end. The last line holds the same
+position for the end of the session.
+"""
+
+import dataclasses
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, List, NamedTuple, Optional, TextIO, Tuple
+
+from tinyinput import InputEvent, KeyEvent, MouseEvent, PasteEvent
+
+
+RECORD_ENV = "TINYTUIS_RECORD"
+FORMAT_VERSION = 1
+
+EVENT_KINDS = {"k": KeyEvent, "m": MouseEvent, "p": PasteEvent}
+KIND_OF = {cls: kind for kind, cls in EVENT_KINDS.items()}
+
+
+def encode_event(event: InputEvent) -> list:
+    """[kind, fields...] for an event, trailing default fields left out."""
+    fields = dataclasses.fields(event)
+    values = [getattr(event, field.name) for field in fields]
+    while values and values[-1] == fields[len(values) - 1].default:
+        values.pop()
+    return [KIND_OF[type(event)]] + values
+
+
+def decode_event(data: list) -> InputEvent:
+    return EVENT_KINDS[data[0]](*data[1:])
+
+
+class Recorded(NamedTuple):
+    """An event and where in the session it arrived."""
+    ms: int  # wall-clock milliseconds since recording started
+    tick: int  # scheduler.ticks when it was handled
+    frame: int  # scheduler.frames when it was handled
+    event: InputEvent
+
+
+class Session(NamedTuple):
+    issue: str  # the issue's directory, e.g. "06-caret-cuts"
+    class_name: str
+    seed: int
+    size: Tuple[int, int]  # columns, lines
+    events: List[Recorded]
+    end: Tuple[int, int, int]  # ms, tick, frame when recording stopped
+
+
+class Recorder:
+    """Writes an issue's session to a stream as it is played."""
+
+    def __init__(self, issue, out: TextIO, seed: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.issue = issue
+        self.out = out
+        self.clock = clock
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        # A live issue's rng is unseeded; reseed it so a replay can match it
+        issue.rng.seed(self.seed)
+        self.started = clock()
+
+        module = sys.modules[type(issue).__module__]
+        header = {
+            "tinytuis": FORMAT_VERSION,
+            "issue": os.path.basename(os.path.dirname(os.path.abspath(module.__file__))),
+            "class": type(issue).__name__,
+            "seed": self.seed,
+            "size": [issue.terminal_size.columns, issue.terminal_size.lines],
+        }
+        self._write(header)
+
+    def _write(self, data):
+        self.out.write(json.dumps(data, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+    def _position(self) -> list:
+        scheduler = self.issue.scheduler
+        return [round((self.clock() - self.started) * 1000), scheduler.ticks, scheduler.frames]
+
+    def record(self, event: InputEvent):
+        self._write(self._position() + encode_event(event))
+
+    def hook(self, handle_key: Callable[[InputEvent], None]) -> Callable[[InputEvent], None]:
+        """handle_key, recording each event before handing it on."""
+        def recorded(event):
+            self.record(event)
+            handle_key(event)
+        return recorded
+
+    def close(self):
+        self._write({"end": self._position()})
+        self.out.close()
+
+
+def record_if_requested(issue) -> Optional[Recorder]:
+    """A Recorder writing to the file named by TINYTUIS_RECORD, if set."""
+    path = os.environ.get(RECORD_ENV)
+    if not path:
+        return None
+    return Recorder(issue, open(path, "w", encoding="utf-8"))
+
+
+def load_session(path: str) -> Session:
+    """Read a recorded session back."""
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("tinytuis") != FORMAT_VERSION:
+            raise ValueError(f"{path}: not a TinyTUIs session")
+        events = []
+        end = None
+        for line in f:
+            data = json.loads(line)
+            if isinstance(data, dict):
+                end = tuple(data["end"])
+                break
+            ms, tick, frame = data[:3]
+            events.append(Recorded(ms, tick, frame, decode_event(data[3:])))
+
+    if end is None:
+        # Cut short (killed before it could close): end at the last event
+        last = events[-1] if events else Recorded(0, 0, 0, None)
+        end = (last.ms, last.tick, last.frame)
+    columns, lines = header["size"]
+    return Session(header["issue"], header["class"], header["seed"], (columns, lines), events, end)
@@ -0,0 +1,616 @@
+"""
+tinyscreen - diff-based terminal output for TinyTUIs.
+
+A Screen is a drop-in stand-in for tinykit's Canvas (same put_char /
+put_text / clear / render surface) that remembers the last frame it
+flushed to the terminal. present() then sends only the cursor moves and
+color codes for cells that changed, instead of clear_screen() followed by
+a full print of the frame.
+
+Frames are double-buffered: issues draw into the back buffer, present()
+builds the delta into one reusable buffer and hands it to the terminal
+in a single os.write, wrapped in synchronized-output brackets (DEC mode
+2026) where the terminal understands them, so a frame never shows up
+half-drawn.
+
+Writes are tracked as dirty column spans per row, so clear(), the
+delta scan and render() only touch rows that were drawn on since the
+last frame; a page nobody redrew costs next to nothing to present.
+
+Color codes are emitted per run rather than per cell: neighbouring cells
+that share a color get one SGR sequence between them and no reset.
+
+Cells live in flat array planes rather than lists of strings: one
+codepoint plane and one style plane per buffer, where a style is a small
+integer id into a palette of interned color strings. A 300x100 screen is
+a few hundred kilobytes, clearing is a slice copy from a blank plane, and
+unchanged rows are skipped by comparing memoryview slices.
+
+Double-width glyphs (East Asian wide and fullwidth) take two cells: the
+glyph itself and a WIDE_TAIL cell after it that renders as nothing, so
+the cursor the delta scan tracks stays in step with the terminal's.
+Writing over either half of one blanks the other.
+
+snapshot() copies the frame being drawn out of the planes and blit()
+puts it back with two slice copies, for frames that are expensive to
+draw but come back unchanged, like the pages of a comic.
+
+Set cast to a tinycast.CastWriter and each presented delta is streamed
+into an asciicast file as well.
+"""
+
+import io
+import os
+import re
+import sys
+from array import array
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+from unicodedata import east_asian_width
+
+
+CSI = "\033["
+RESET = "\033[0m"
+SYNC_BEGIN = "\033[?2026h"
+SYNC_END = "\033[?2026l"
+
+# Terminals known to honour DEC mode 2026 (synchronized output)
+SYNC_TERM_PROGRAMS = ("iTerm.app", "WezTerm", "vscode", "ghostty", "contour", "tmux")
+SYNC_TERMS = ("kitty", "foot", "alacritty", "wezterm", "ghostty", "contour", "tmux")
+
+# One 32-bit codepoint per cell; text moves in and out of the plane as UTF-32
+CELL_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+CELL_CODEC = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+BLANK = ord(" ")
+NO_STYLE = 0
+MAX_STYLES = 0x10000  # style ids are 16-bit
+
+# The cell under the right half of a double-width glyph
+WIDE_TAIL = 0
+# Nothing below U+1100 is double width, so most characters skip the lookup
+FIRST_WIDE = 0x1100
+# Blocks holding every double-width character (and a few single-width
+# ones); text that matches none of them, box drawing included, is drawn
+# without looking at each character
+MAYBE_WIDE = re.compile(
+    "[\u1100-\u115f\u231a-\u23ff\u25fd\u25fe\u2614\u2615\u2648-\u2653\u267f-\u26fd"
+    "\u2705\u270a\u270b\u2728\u274c-\u2757\u2795-\u27bf\u2b1b-\u2b55\u2e80-\ua4cf"
+    "\ua960-\ua97f\uac00-\ud7a3\uf900-\ufaff\ufe10-\ufe6f\uff00-\uff60\uffe0-\uffe6"
+    "\U00016fe0-\U0001b2ff\U0001f000-\U0001faff\U00020000-\U0003fffd]")
+
+
+def move_to(x: int, y: int) -> str:
+    """Cursor position escape for a zero-based cell."""
+    return f"{CSI}{y + 1};{x + 1}H"
+
+
+def supports_synchronized_output() -> bool:
+    """Best guess at whether the terminal understands DEC mode 2026.
+
+    TINYTUIS_SYNC=1 or 0 overrides the guess.
+    """
+    forced = os.environ.get("TINYTUIS_SYNC")
+    if forced is not None:
+        return forced not in ("", "0")
+    if os.environ.get("TERM_PROGRAM", "") in SYNC_TERM_PROGRAMS:
+        return True
+    term = os.environ.get("TERM", "")
+    return any(name in term for name in SYNC_TERMS)
+
+
+@lru_cache(maxsize=1024)
+def is_wide(code: int) -> bool:
+    """True if the codepoint takes two terminal columns."""
+    return code >= FIRST_WIDE and east_asian_width(chr(code)) in ("W", "F")
+
+
+def text_width(text: str) -> int:
+    """Terminal columns a string takes."""
+    if MAYBE_WIDE.search(text) is None:
+        return len(text)
+    return sum(2 if is_wide(ord(char)) else 1 for char in text)
+
+
+def lay_out(codes: Iterable[int]) -> array:
+    """Codepoints as cells: each double-width glyph followed by a WIDE_TAIL."""
+    run = array(CELL_TYPECODE)
+    for code in codes:
+        run.append(code)
+        if is_wide(code):
+            run.append(WIDE_TAIL)
+    return run
+
+
+@dataclass
+class Snapshot:
+    """A frame copied out of a Screen by snapshot(), to blit() back onto it."""
+    width: int
+    height: int
+    chars: array
+    styles: array  # ids into palette
+    used_lo: List[int]
+    used_hi: List[int]
+    palette: List[str]  # the screen's palette when it was taken
+
+    @property
+    def nbytes(self) -> int:
+        return (len(self.chars) * self.chars.itemsize
+                + len(self.styles) * self.styles.itemsize)
+
+
+class Screen:
+    def __init__(self, width: int, height: int, theme, out: Optional[TextIO] = None,
+                 sync: Optional[bool] = None, profiler=None):
+        self.width = max(0, width)
+        self.height = max(0, height)
+        self.theme = theme
+        self.out = out
+        self.sync = supports_synchronized_output() if sync is None else sync
+        self.reset = getattr(theme, "reset", RESET)
+        self.profiler = profiler  # optional FrameProfiler timing present()
+        self.cast = None  # optional tinycast.CastWriter fed every frame's delta
+
+        # Interned color strings; style id 0 is "no color"
+        self.palette: List[str] = [""]
+        self._style_ids: Dict[str, int] = {"": NO_STYLE}
+
+        size = self.width * self.height
+        self._blank_chars = array(CELL_TYPECODE, [BLANK]) * size
+        self._blank_styles = array("H", [NO_STYLE]) * size
+
+        # Back buffer: the frame being drawn by the issue
+        self._chars = array(CELL_TYPECODE, self._blank_chars)
+        self._styles = array("H", self._blank_styles)
+
+        # Front buffer: the frame on the terminal
+        self._front_chars = array(CELL_TYPECODE, self._blank_chars)
+        self._front_styles = array("H", self._blank_styles)
+        self._views()
+
+        # Set once a double-width glyph is drawn; until then no write can
+        # cut one in half, so the checks for that are skipped
+        self._wide = False
+
+        # False while the terminal holds something we did not draw
+        # (intro text, another program), forcing a full repaint
+        self._front_valid = False
+
+        # Reused for every frame so presenting does not allocate a new buffer
+        self._frame = io.StringIO()
+
+        # Per-row column spans [lo, hi) written since the last present();
+        # lo >= hi means the row is clean
+        self._dirty_lo = [self.width] * self.height
+        self._dirty_hi = [0] * self.height
+
+        # Per-row span that may hold something other than blanks, so
+        # clear() only wipes what was actually drawn
+        self._used_lo = [self.width] * self.height
+        self._used_hi = [0] * self.height
+
+        # render() output per row, None once the row has been drawn on
+        self._row_cache: List[Optional[str]] = [None] * self.height
+
+        # Output accounting for the last present(), and SGR bytes saved by
+        # coalescing runs compared to a color + reset around every cell
+        self.frame_bytes = 0
+        self.frame_sgr_saved = 0
+        self.total_sgr_saved = 0
+
+    def _views(self):
+        """Memoryviews over the planes for cheap span comparisons."""
+        self._chars_view = memoryview(self._chars)
+        self._styles_view = memoryview(self._styles)
+        self._front_chars_view = memoryview(self._front_chars)
+        self._front_styles_view = memoryview(self._front_styles)
+
+    def style_id(self, color: Optional[str]) -> int:
+        """Intern a color string and return its palette id.
+
+        The palette holds MAX_STYLES colors. Once it is full, colors
+        neither buffer shows any more are dropped to make room; if every
+        one is still on screen, the new color draws as no color.
+        """
+        if not color:
+            return NO_STYLE
+        style = self._style_ids.get(color)
+        if style is None:
+            style = self._add_style(color)
+        return style
+
+    def _add_style(self, color: str, compact: bool = True) -> int:
+        """Give a color the next palette id, compacting a full palette if allowed."""
+        if len(self.palette) >= MAX_STYLES:
+            if compact:
+                self._compact_palette()
+            if len(self.palette) >= MAX_STYLES:
+                return NO_STYLE
+        style = len(self.palette)
+        self.palette.append(color)
+        self._style_ids[color] = style
+        return style
+
+    def _compact_palette(self):
+        """Drop the colors no cell uses, renumbering the rest in both buffers."""
+        used = sorted(set(self._styles) | set(self._front_styles) | {NO_STYLE})
+        old = self.palette
+        # A new list rather than an edit, so snapshots keep the one their ids index
+        self.palette = [old[style] for style in used]
+        self._style_ids = {color: style for style, color in enumerate(self.palette)}
+        ids = array("H", [NO_STYLE]) * len(old)
+        for style, old_style in enumerate(used):
+            ids[old_style] = style
+        for plane in (self._styles, self._front_styles):
+            plane[:] = array("H", map(ids.__getitem__, plane))
+
+    def cell(self, x: int, y: int) -> Tuple[str, str]:
+        """The (char, color) drawn at a cell of the back buffer."""
+        i = y * self.width + x
+        return chr(self._chars[i]), self.palette[self._styles[i]]
+
+    def _touch(self, y: int, lo: int, hi: int):
+        """Record that columns [lo, hi) of row y were written."""
+        if lo < self._dirty_lo[y]:
+            self._dirty_lo[y] = lo
+        if hi > self._dirty_hi[y]:
+            self._dirty_hi[y] = hi
+        if lo < self._used_lo[y]:
+            self._used_lo[y] = lo
+        if hi > self._used_hi[y]:
+            self._used_hi[y] = hi
+        self._row_cache[y] = None
+
+    @property
+    def dirty(self) -> bool:
+        """True if anything was written since the last present()."""
+        return not self._front_valid or any(
+            lo < hi for lo, hi in zip(self._dirty_lo, self._dirty_hi))
+
+    def clear(self):
+        """Blank the frame being drawn."""
+        width = self.width
+        for y in range(self.height):
+            lo, hi = self._used_lo[y], self._used_hi[y]
+            if lo >= hi:
+                continue
+            start, end = y * width + lo, y * width + hi
+            self._chars[start:end] = self._blank_chars[:end - start]
+            self._styles[start:end] = self._blank_styles[:end - start]
+            self._touch(y, lo, hi)
+            self._used_lo[y], self._used_hi[y] = width, 0
+
+    def snapshot(self) -> Snapshot:
+        """A copy of the frame being drawn."""
+        return Snapshot(self.width, self.height, array(CELL_TYPECODE, self._chars),
+                        array("H", self._styles), list(self._used_lo), list(self._used_hi),
+                        self.palette)
+
+    def blit(self, snapshot: Snapshot):
+        """Replace the frame being drawn with a snapshot this screen took earlier."""
+        if (snapshot.width, snapshot.height) != (self.width, self.height):
+            raise ValueError("snapshot was taken from a screen of another size")
+        if snapshot.palette is not self.palette:
+            # The palette was compacted since; move the snapshot over to the new
+            # ids. Compacting again partway would renumber ids already handed
+            # out, so make room first and intern without it
+            colors = {style: snapshot.palette[style] for style in set(snapshot.styles)}
+            if len(self.palette) + len(colors) > MAX_STYLES:
+                self._compact_palette()
+            ids = {}
+            for style, color in colors.items():
+                new = self._style_ids.get(color) if color else NO_STYLE
+                ids[style] = self._add_style(color, compact=False) if new is None else new
+            snapshot.styles = array("H", map(ids.__getitem__, snapshot.styles))
+            snapshot.palette = self.palette
+        self._chars[:] = snapshot.chars
+        self._styles[:] = snapshot.styles
+        for y in range(self.height):
+            lo, hi = snapshot.used_lo[y], snapshot.used_hi[y]
+            old_lo, old_hi = self._used_lo[y], self._used_hi[y]
+            # Both what was drawn before and what the snapshot holds may have changed
+            if lo < hi or old_lo < old_hi:
+                self._touch(y, min(lo, old_lo), max(hi, old_hi))
+            self._used_lo[y], self._used_hi[y] = lo, hi
+
+    def put_char(self, x: int, y: int, char: str, color: Optional[str] = None):
+        """Place a single character, clipped to the screen."""
+        if 0 <= x < self.width and 0 <= y < self.height and char:
+            code = ord(char[0])
+            if is_wide(code):
+                self.put_text(x, y, char[0], color)
+                return
+            i = y * self.width + x
+            self._chars[i] = code
+            self._styles[i] = self.style_id(color)
+            self._touch(y, x, x + 1)
+            if self._wide:
+                self._mend(y, x, x + 1)
+
+    def put_chars(self, cells: Iterable[Tuple[int, int, str, Optional[str]]]):
+        """Place many (x, y, char, color) characters; put_char() in bulk, for particles."""
+        width, height = self.width, self.height
+        chars, styles = self._chars, self._styles
+        ids: Dict[Optional[str], int] = {}
+        palette = self.palette
+        spans: Dict[int, List[int]] = {}
+        for x, y, char, color in cells:
+            if 0 <= x < width and 0 <= y < height and char:
+                code = ord(char[0])
+                if code >= FIRST_WIDE and is_wide(code):
+                    self.put_text(x, y, char[0], color)
+                    if self.palette is not palette:
+                        ids.clear()  # compacted: the ids looked up so far were renumbered
+                        palette = self.palette
+                    continue
+                i = y * width + x
+                chars[i] = code
+                style = ids.get(color)
+                if style is None:
+                    style = self.style_id(color)
+                    if self.palette is not palette:
+                        ids.clear()
+                        palette = self.palette
+                    ids[color] = style
+                styles[i] = style
+                span = spans.get(y)
+                if span is None:
+                    spans[y] = [x, x + 1]
+                elif x < span[0]:
+                    span[0] = x
+                elif x >= span[1]:
+                    span[1] = x + 1
+                if self._wide:
+                    self._mend(y, x, x + 1)
+        for y, (lo, hi) in spans.items():
+            self._touch(y, lo, hi)
+
+    def put_text(self, x: int, y: int, text: str, color: Optional[str] = None):
+        """Place a run of characters starting at (x, y), clipped to the screen."""
+        if not 0 <= y < self.height:
+            return
+        if MAYBE_WIDE.search(text) is None:
+            lo = max(0, x)
+            hi = min(self.width, x + len(text))
+            if lo >= hi:
+                return
+            start, end = y * self.width + lo, y * self.width + hi
+            run = array(CELL_TYPECODE)
+            run.frombytes(text[lo - x:hi - x].encode(CELL_CODEC))
+            self._chars[start:end] = run
+            self._styles[start:end] = array("H", [self.style_id(color)]) * (hi - lo)
+            self._touch(y, lo, hi)
+            if self._wide:
+                self._mend(y, lo, hi)
+        else:
+            self.put_cells(x, y, lay_out(map(ord, text)), color, wide=True)
+
+    def put_cells(self, x: int, y: int, cells: array, color: Optional[str] = None,
+                  wide: bool = False):
+        """put_text() for a run already in cells (a CELL_TYPECODE array), so nothing is encoded.
+
+        Pass wide=True if the run may hold double-width glyphs, laid out
+        as lay_out() does.
+        """
+        if not 0 <= y < self.height:
+            return
+        if wide:
+            self._wide = True
+        lo = max(0, x)
+        hi = min(self.width, x + len(cells))
+        if lo >= hi:
+            return
+        start, end = y * self.width + lo, y * self.width + hi
+        self._chars[start:end] = cells[lo - x:hi - x]
+        self._styles[start:end] = array("H", [self.style_id(color)]) * (hi - lo)
+        self._touch(y, lo, hi)
+        if self._wide:
+            self._mend(y, lo, hi)
+
+    def _mend(self, y: int, lo: int, hi: int):
+        """Blank the half of any double-width glyph a write to columns [lo, hi) cut off."""
+        chars, width = self._chars, self.width
+        row = y * width
+        for x in (lo, hi):
+            lead = x > 0 and is_wide(chars[row + x - 1])
+            tail = x < width and chars[row + x] == WIDE_TAIL
+            if lead and not tail:
+                chars[row + x - 1] = BLANK
+                self._touch(y, x - 1, x)
+            elif tail and not lead:
+                chars[row + x] = BLANK
+                self._touch(y, x, x + 1)
+
+    def _text(self, start: int, end: int) -> str:
+        text = self._chars[start:end].tobytes().decode(CELL_CODEC)
+        # The glyph before a WIDE_TAIL already covers its column
+        return text.replace("\0", "") if self._wide else text
+
+    def _render_row(self, y: int) -> str:
+        line = []
+        pen = ""
+        start = y * self.width
+        styles = self._styles
+        x = 0
+        while x < self.width:
+            style = styles[start + x]
+            end = x + 1
+            while end < self.width and styles[start + end] == style:
+                end += 1
+            color = self.palette[style]
+            if color != pen:
+                line.append(self._pen_change(pen, color))
+                pen = color
+            line.append(self._text(start + x, start + end))
+            x = end
+        if pen:
+            line.append(self.reset)
+        return "".join(line)
+
+    def _pen_change(self, pen: str, color: str) -> str:
+        """SGR that switches the terminal from one cell color to another."""
+        if not color:
+            return self.reset
+        # Colors may carry attributes (bold, background), so start clean
+        return f"{self.reset}{color}" if pen else color
+
+    def render(self) -> str:
+        """Return the whole frame as a printable string, rebuilding only rows drawn on."""
+        cache = self._row_cache
+        for y in range(self.height):
+            if cache[y] is None:
+                cache[y] = self._render_row(y)
+        return "\n".join(cache)
+
+    def invalidate(self):
+        """Forget what the terminal shows so the next present() repaints everything."""
+        self._front_valid = False
+
+    def swap(self):
+        """Make the back buffer the shown frame and start the next one from it."""
+        self._chars, self._front_chars = self._front_chars, self._chars
+        self._styles, self._front_styles = self._front_styles, self._styles
+        self._views()
+
+        # The buffers only differ where this frame wrote, unless the old
+        # front never reached the terminal
+        if not self._front_valid:
+            self._chars[:] = self._front_chars
+            self._styles[:] = self._front_styles
+        width = self.width
+        for y in range(self.height):
+            lo, hi = self._dirty_lo[y], self._dirty_hi[y]
+            if lo < hi and self._front_valid:
+                start, end = y * width + lo, y * width + hi
+                self._chars[start:end] = self._front_chars[start:end]
+                self._styles[start:end] = self._front_styles[start:end]
+            self._dirty_lo[y], self._dirty_hi[y] = width, 0
+        self._front_valid = True
+
+    def write_diff(self, buf: TextIO) -> int:
+        """Write the escape sequences that turn the front buffer into the back buffer.
+
+        Returns how many SGR bytes run coalescing saved.
+        """
+        full = not self._front_valid
+        if full:
+            buf.write(f"{CSI}2J")
+
+        chars, styles = self._chars, self._styles
+        front_chars, front_styles = self._front_chars, self._front_styles
+        palette = self.palette
+        width = self.width
+        reset_len = len(self.reset)
+        naive_sgr = 0
+        sgr = 0
+        pen = ""
+
+        for y in range(self.height):
+            lo, hi = (0, width) if full else (self._dirty_lo[y], self._dirty_hi[y])
+            if lo >= hi:
+                continue
+            row = y * width
+            start, end = row + lo, row + hi
+            if not full and (self._chars_view[start:end] == self._front_chars_view[start:end]
+                             and self._styles_view[start:end] == self._front_styles_view[start:end]):
+                continue
+
+            cursor = -1  # where the terminal cursor sits on this row
+            i = start
+            while i < end:
+                style = styles[i]
+                if full:
+                    if chars[i] == BLANK and style == NO_STYLE:
+                        i += 1
+                        continue
+                elif chars[i] == front_chars[i] and style == front_styles[i]:
+                    i += 1
+                    continue
+                if chars[i] == WIDE_TAIL:
+                    # Drawn along with the glyph before it
+                    i += 1
+                    continue
+
+                # Extend over the following changed cells that share this style
+                run_end = i + 1
+                while run_end < end and styles[run_end] == style and (
+                        full or chars[run_end] != front_chars[run_end]
+                        or style != front_styles[run_end]):
+                    run_end += 1
+                # A double-width glyph moves the cursor over its tail too
+                if run_end < row + width and chars[run_end] == WIDE_TAIL:
+                    run_end += 1
+
+                if i != cursor:
+                    buf.write(move_to(i - row, y))
+                color = palette[style]
+                if color != pen:
+                    change = self._pen_change(pen, color)
+                    buf.write(change)
+                    sgr += len(change)
+                    pen = color
+                if color:
+                    naive_sgr += (len(color) + reset_len) * (run_end - i)
+                buf.write(self._text(i, run_end))
+                cursor = i = run_end
+
+        if pen:
+            buf.write(self.reset)
+            sgr += reset_len
+        return naive_sgr - sgr
+
+    def diff(self) -> str:
+        """Delta for the current frame as a string; marks it as shown."""
+        buf = io.StringIO()
+        self.write_diff(buf)
+        self.swap()
+        return buf.getvalue()
+
+    def present(self):
+        """Flush changed cells to the terminal; replaces clear_screen() + print(render())."""
+        frame = self._frame
+        with self._section("diff"):
+            frame.seek(0)
+            frame.truncate()
+            if self.sync:
+                frame.write(SYNC_BEGIN)
+            start = frame.tell()
+            saved = self.write_diff(frame)
+            end = frame.tell()
+            changed = end != start
+            if self.sync:
+                frame.write(SYNC_END)
+            self.swap()
+
+        self.frame_sgr_saved = saved
+        self.total_sgr_saved += saved
+        self.frame_bytes = 0
+        if changed:
+            with self._section("write"):
+                data = frame.getvalue()
+                self.frame_bytes = self._write(data)
+                if self.cast is not None:
+                    self.cast.frame(data[start:end])
+
+    def _section(self, name: str):
+        return self.profiler.section(name) if self.profiler is not None else nullcontext()
+
+    def _write(self, data: str) -> int:
+        """Hand a finished frame to the terminal in one write; returns bytes sent."""
+        out = self.out or sys.stdout
+        encoded = data.encode(getattr(out, "encoding", None) or "utf-8")
+        try:
+            fd = out.fileno()
+        except (AttributeError, OSError, ValueError):
+            out.write(data)
+            out.flush()
+            return len(encoded)
+
+        # Anything print()ed earlier must land before the frame
+        out.flush()
+        payload = memoryview(encoded)
+        while payload:
+            written = os.write(fd, payload)
+            payload = payload[written:]
+        return len(encoded)
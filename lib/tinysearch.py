@@ -0,0 +1,79 @@
+"""
+tinysearch - type-to-filter over a catalog.
+
+A SearchIndex is built once over a list of texts (titles and
+descriptions). A query matches a text when every word of the query
+starts a word of the text, so "amb lig" finds Amber Light and "snow"
+finds snowflakes, while "now" does not.
+
+Query words of one or two characters are looked up in a table of word
+prefixes; longer ones through trigram postings, whose intersection
+leaves a handful of candidates to check. Typing usually extends the
+last query, which can only narrow its results, so then only the
+previous hits are rechecked. Either way a keystroke over thousands of
+texts costs well under a frame.
+
+    index = SearchIndex(issue.title + " " + issue.description for issue in issues)
+    hits = index.search("caret")  # positions in the original list, in order
+"""
+
+import re
+from typing import Dict, Iterable, List
+
+
+WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> List[str]:
+    return WORD.findall(text.lower())
+
+
+class SearchIndex:
+    def __init__(self, texts: Iterable[str]):
+        # Each text as " word word ...", so a word start is " " + word
+        self._texts = [" " + " ".join(words(text)) for text in texts]
+        self._prefixes: Dict[str, List[int]] = {}
+        self._trigrams: Dict[str, List[int]] = {}
+        for i, text in enumerate(self._texts):
+            for prefix in {word[:n] for word in text.split() for n in (1, 2)}:
+                self._prefixes.setdefault(prefix, []).append(i)
+            for gram in {text[j:j + 3] for j in range(len(text) - 2)}:
+                self._trigrams.setdefault(gram, []).append(i)
+
+        self._last_terms: List[str] = []
+        self._last_hits = list(range(len(self._texts)))
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _candidates(self, term: str) -> List[int]:
+        """Texts that may hold a word starting with term; a superset for long terms."""
+        if len(term) < 3:
+            return self._prefixes.get(term[:2], [])
+        postings = sorted((self._trigrams.get(term[j:j + 3], []) for j in range(len(term) - 2)), key=len)
+        hits = set(postings[0])
+        for posting in postings[1:]:
+            if not hits:
+                break
+            hits.intersection_update(posting)
+        return sorted(hits)
+
+    def search(self, query: str) -> List[int]:
+        """Positions of the texts matching query, in their original order."""
+        terms = words(query)
+        if not terms:
+            hits = list(range(len(self._texts)))
+        else:
+            last = self._last_terms
+            if last and len(terms) >= len(last) and all(
+                    term.startswith(old) for term, old in zip(terms, last)):
+                # The query only grew, so its hits are among the last ones
+                candidates = self._last_hits
+            else:
+                candidates = min((self._candidates(term) for term in terms), key=len)
+            needles = [" " + term for term in terms]
+            texts = self._texts
+            hits = [i for i in candidates if all(needle in texts[i] for needle in needles)]
+        self._last_terms = terms
+        self._last_hits = hits
+        return hits
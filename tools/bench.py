@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+TinyTUIs bench - drive every issue headlessly and time it.
+
+Each issue is built at a fixed size with a seeded RNG and an in-memory
+sink, then stepped through N frames of update + render + present with a
+little scripted input, so numbers are comparable run to run. Reports
+frames/sec, bytes/frame, p50/p99 frame time and peak memory.
+
+    python tools/bench.py --frames 1000 --size 120x40
+    python tools/bench.py --issue winter --issue caret --json
+
+Sessions recorded with TINYTUIS_RECORD make real workloads; --session
+replays them (at the size and seed they were recorded with) instead:
+
+    TINYTUIS_RECORD=caret.rec python issues/06-caret-cuts/main.py
+    python tools/bench.py --session caret.rec
+
+--check-replay records each issue's scripted run with stalls in its
+frame pacing, as a busy machine has, replays the session and checks that
+the replay ends in the same state and on the same frame:
+
+    python tools/bench.py --check-replay
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+# Add lib to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+import tinylaunch
+from tinycatalog import Catalog, Status
+from tinyheadless import ManualClock, headless, replay, run_frames
+from tinyinput import KeyEvent, MouseEvent, KEY_ENTER, KEY_LEFT, KEY_RIGHT
+from tinyloop import frame_hooks, start_issue
+from tinyrecord import Recorder, load_session
+
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# Input played on a loop, one event every INPUT_EVERY frames, so the
+# workload includes what players actually do
+INPUT_EVERY = 10
+SCRIPTS: Dict[str, List] = {
+    "WinterHush": [KEY_LEFT] * 6 + [KEY_RIGHT] * 6,
+    "FragmentsStream": [KeyEvent(" ")],
+    "GutterReader": [KEY_RIGHT, KEY_RIGHT, KeyEvent(" "), KEY_RIGHT, KEY_RIGHT, KeyEvent(" "),
+                     KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT],
+    "EchoChamber": [KeyEvent(c) for c in "hello, echo"] + [KEY_ENTER],
+    "AmberTerminal": [],
+    "CaretCuts": [MouseEvent(20, 8, "left", "press"), MouseEvent(40, 12, "left", "press"),
+                  MouseEvent(60, 6, "left", "press")],
+}
+
+
+def available_issues() -> List[Tuple[str, str]]:
+    """(directory, entry class) of every issue in the catalog that can be run."""
+    return [(issue.directory, issue.entry)
+            for issue in Catalog(os.path.join(ROOT, "issues")).refresh()
+            if issue.status is Status.AVAILABLE]
+
+
+def load_issue(directory: str, class_name: str):
+    """An issue's class, by its directory under issues/."""
+    return tinylaunch.load_issue(os.path.join(ROOT, "issues", directory, "main.py"), class_name)
+
+
+def scripted(events: List) -> Callable[[int], List]:
+    def feed(frame: int) -> List:
+        if not events or frame % INPUT_EVERY:
+            return []
+        return [events[(frame // INPUT_EVERY) % len(events)]]
+    return feed
+
+
+def measure(name: str, play: Callable[[], object]) -> Dict[str, object]:
+    """Time play(), which runs a headless issue and returns it, then rerun it for peak memory."""
+    start = time.perf_counter()
+    issue = play()
+    elapsed = time.perf_counter() - start
+    summary = issue.profiler.summary()
+
+    # Same run again under tracemalloc, which would skew the timings
+    tracemalloc.start()
+    play()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    drawn = summary["frames"]
+    return {
+        "issue": name,
+        "frames": drawn,
+        "fps": drawn / elapsed if elapsed else 0.0,
+        "bytes_per_frame": summary["bytes_per_frame"],
+        "p50_ms": summary["frame"]["p50_ms"],
+        "p99_ms": summary["frame"]["p99_ms"],
+        "peak_kib": peak / 1024,
+    }
+
+
+def bench(issue_class, frames: int, columns: int, lines: int, seed: int) -> Dict[str, object]:
+    script = SCRIPTS.get(issue_class.__name__, [])
+
+    def play():
+        issue = headless(issue_class, columns, lines, seed)
+        run_frames(issue, frames, scripted(script))
+        return issue
+    return measure(issue_class.__name__, play)
+
+
+def bench_session(path: str) -> Dict[str, object]:
+    """Benchmark a session recorded with TINYTUIS_RECORD, replayed at full speed."""
+    session = load_session(path)
+    issue_class = load_issue(session.issue, session.class_name)
+    return measure(os.path.basename(path), lambda: replay(issue_class, session))
+
+
+class StallingClock(ManualClock):
+    """A ManualClock on which every few sleeps overrun, so frames are dropped and ticks bunch up."""
+
+    def __init__(self, every: int = 4, factor: float = 3.0):
+        super().__init__()
+        self.every = every
+        self.factor = factor
+        self.sleeps = 0
+
+    def sleep(self, seconds: float):
+        self.sleeps += 1
+        super().sleep(seconds * self.factor if self.sleeps % self.every == 0 else seconds)
+
+
+def check_replay(issue_class, frames: int, columns: int, lines: int, seed: int) -> List[str]:
+    """Record a scripted run with uneven pacing, replay it, and list what differs."""
+    live = headless(issue_class, columns, lines, seed, start=False)
+    clock = StallingClock()
+    live.scheduler.clock = clock
+    live.scheduler.sleep = clock.sleep
+    feed = scripted(SCRIPTS.get(issue_class.__name__, []))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "check.rec")
+        # In the order drive() goes: reseed, start, then play
+        recorder = Recorder(live, open(path, "w", encoding="utf-8"), seed=seed, clock=clock)
+        start_issue(live)
+
+        def recorded(frame: int) -> List:
+            events = feed(frame)
+            for event in events:
+                recorder.record(event)
+            return events
+        run_frames(live, frames, recorded, draw_every_frame=False)
+        recorder.close()
+        replayed = replay(issue_class, load_session(path))
+
+    differences = []
+    if live.rng.getstate() != replayed.rng.getstate():
+        differences.append("rng state")
+    if live.scheduler.ticks != replayed.scheduler.ticks:
+        differences.append(f"ticks {live.scheduler.ticks} != {replayed.scheduler.ticks}")
+    # Draw both once more, at the same tick, and compare what is on the canvas
+    for issue in (live, replayed):
+        frame_hooks(issue)[2]()
+    if live.canvas.render() != replayed.canvas.render():
+        differences.append("last frame")
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TinyTUIs issues headlessly.")
+    parser.add_argument("--frames", type=int, default=500, help="frames per issue (default 500)")
+    parser.add_argument("--size", default="80x24", help="terminal size as COLUMNSxLINES (default 80x24)")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed (default 0)")
+    parser.add_argument("--issue", action="append", default=[],
+                        help="only issues whose directory contains this; repeatable")
+    parser.add_argument("--session", action="append", default=[],
+                        help="replay this recorded session instead; repeatable")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--check-replay", action="store_true",
+                        help="check that recorded runs replay to the same state instead of timing")
+    args = parser.parse_args()
+
+    try:
+        columns, lines = (int(n) for n in args.size.lower().split("x"))
+    except ValueError:
+        parser.error(f"bad --size {args.size!r}, expected e.g. 120x40")
+
+    if args.check_replay:
+        failed = False
+        for d, c in available_issues():
+            if args.issue and not any(name in d for name in args.issue):
+                continue
+            differences = check_replay(load_issue(d, c), args.frames, columns, lines, args.seed)
+            failed = failed or bool(differences)
+            print(f"{c:<16} " + (f"differs: {', '.join(differences)}" if differences else "replays the same"))
+        sys.exit(1 if failed else 0)
+
+    if args.session:
+        results = [bench_session(path) for path in args.session]
+    else:
+        chosen = [(d, c) for d, c in available_issues()
+                  if not args.issue or any(name in d for name in args.issue)]
+        results = [bench(load_issue(d, c), args.frames, columns, lines, args.seed)
+                   for d, c in chosen]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'issue':<16} {'frames':>7} {'fps':>9} {'B/frame':>9} {'p50 ms':>8} {'p99 ms':>8} {'peak KiB':>9}")
+    for r in results:
+        print(f"{r['issue']:<16} {r['frames']:>7} {r['fps']:>9.0f} {r['bytes_per_frame']:>9.0f} "
+              f"{r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f} {r['peak_kib']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+TinyTUIs cast - make asciicast previews of the issues without a terminal.
+
+Each issue is run headlessly, the way tools/bench.py runs it (fixed size,
+seeded, scripted input), and its frames are streamed into
+<out>/<issue>.cast for the catalog's players. A recorded session can be
+cast instead of the script.
+
+    python tools/cast.py --frames 300 --size 80x24 --out site/casts
+    python tools/cast.py --session caret.rec --out site/casts
+"""
+
+import argparse
+import os
+import sys
+
+# Add lib to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+from bench import SCRIPTS, available_issues, load_issue, scripted
+from tinycast import attach
+from tinyheadless import headless, play_session, run_frames
+from tinyrecord import load_session
+
+
+def cast_issue(issue, path: str, play, collapse: bool, merge: float):
+    with open(path, "w", encoding="utf-8") as f:
+        cast = attach(issue, f, collapse=collapse, merge=merge, title=type(issue).__name__)
+        play(issue)
+        cast.flush()
+    print(f"{path}: {cast.frames} frames, {os.path.getsize(path)} bytes"
+          + (f", {cast.collapsed} merged into the frame before" if collapse else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write asciicast previews of TinyTUIs issues.")
+    parser.add_argument("--frames", type=int, default=300, help="frames per issue (default 300)")
+    parser.add_argument("--size", default="80x24", help="terminal size as COLUMNSxLINES (default 80x24)")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed (default 0)")
+    parser.add_argument("--issue", action="append", default=[],
+                        help="only issues whose directory contains this; repeatable")
+    parser.add_argument("--session", action="append", default=[],
+                        help="cast this recorded session instead; repeatable")
+    parser.add_argument("--collapse", action="store_true",
+                        help="merge frames closer together than --merge and shorten long pauses")
+    parser.add_argument("--merge", type=float, default=0.1,
+                        help="with --collapse, seconds within which frames merge (default 0.1)")
+    parser.add_argument("--out", default="casts", help="directory for the .cast files (default casts)")
+    args = parser.parse_args()
+
+    try:
+        columns, lines = (int(n) for n in args.size.lower().split("x"))
+    except ValueError:
+        parser.error(f"bad --size {args.size!r}, expected e.g. 120x40")
+
+    os.makedirs(args.out, exist_ok=True)
+
+    for path in args.session:
+        session = load_session(path)
+        issue_class = load_issue(session.issue, session.class_name)
+        name = os.path.splitext(os.path.basename(path))[0]
+        issue = headless(issue_class, *session.size, session.seed)
+        cast_issue(issue, os.path.join(args.out, f"{name}.cast"),
+                   lambda issue: play_session(issue, session), args.collapse, args.merge)
+    if args.session:
+        return
+
+    for directory, class_name in available_issues():
+        if args.issue and not any(name in directory for name in args.issue):
+            continue
+        issue_class = load_issue(directory, class_name)
+        issue = headless(issue_class, columns, lines, args.seed)
+        feed = scripted(SCRIPTS.get(class_name, []))
+        cast_issue(issue, os.path.join(args.out, f"{directory}.cast"),
+                   lambda issue: run_frames(issue, args.frames, feed, draw_every_frame=False),
+                   args.collapse, args.merge)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+TinyTUIs comic - compile a comic file into a bundle for Gutter.
+
+A bundle holds the same pages already laid out in cells, with the panel
+rows that fit worked out for a few page areas, so Gutter draws them
+without encoding or clipping any text (see lib/tinycomic.py). Without
+a source, Gutter's own comic is compiled.
+
+    python tools/comic.py my-comic.comic --out my-comic.bundle
+    python tools/comic.py --out tooth-birds.bundle --size 90x27
+    python issues/03-gutter/main.py my-comic.bundle
+"""
+
+import argparse
+import os
+import sys
+
+# Add lib to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
+from tinycomic import STANDARD_SIZES, ComicFile, compile_comic
+from tinylaunch import load_issue
+
+
+GUTTER = os.path.join(os.path.dirname(__file__), '..', 'issues', '03-gutter', 'main.py')
+
+
+def parse_size(text: str):
+    columns, lines = (int(n) for n in text.lower().split("x"))
+    return columns, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a comic file into a Gutter bundle.")
+    parser.add_argument("source", nargs="?", help="comic file to compile (default: Gutter's own comic)")
+    parser.add_argument("--out", required=True, help="bundle to write")
+    parser.add_argument("--size", action="append", default=[],
+                        help="page area to lay out for, as COLUMNSxLINES (the terminal less three lines); "
+                             "repeatable, default "
+                             + ", ".join(f"{columns}x{lines}" for columns, lines in STANDARD_SIZES))
+    args = parser.parse_args()
+
+    try:
+        sizes = [parse_size(size) for size in args.size] or list(STANDARD_SIZES)
+    except ValueError:
+        parser.error(f"bad --size in {args.size!r}, expected e.g. 120x37")
+
+    if args.source:
+        with ComicFile(args.source, prefetch=0) as comic:
+            if comic.bundle:
+                parser.error(f"{args.source} is already a bundle")
+            pages = [comic[index] for index in range(len(comic))]
+    else:
+        reader = load_issue(GUTTER, "GutterReader")(terminal_size=os.terminal_size((80, 24)))
+        pages = reader.pages
+
+    compile_comic(args.out, pages, sizes)
+    print(f"{args.out}: {len(pages)} pages, {len(sizes)} layouts, "
+          f"{os.path.getsize(args.out)} bytes")
+
+
+if __name__ == "__main__":
+    main()
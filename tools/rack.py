@@ -6,181 +6,323 @@ Issue #10 - A launcher that displays all TinyTUIs like issues on a spinner rack.
 
 import sys
 import os
-import subprocess
-from dataclasses import dataclass
-from typing import List, Optional
+import textwrap
+from typing import Dict, List, Optional
 
 # Add lib to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
-from tinykit import Canvas, ArtisticThemes, clear_screen, SimpleInput, typewriter_effect
+from tinykit import ArtisticThemes, clear_screen, hide_cursor, show_cursor, get_terminal_size, typewriter_effect
+from tinyinput import (KeyReader, KeyEvent, CTRL_C, KEY_ENTER, KEY_ESCAPE, KEY_UP, KEY_DOWN,
+                       KEY_PAGE_UP, KEY_PAGE_DOWN, KEY_HOME, KEY_END, KEY_BACKSPACE)
+from tinyscreen import Screen
+from tinysearch import SearchIndex
+from tinycatalog import Catalog, Issue, Status
+from tinylaunch import WorkerPool, launch
 
 
-@dataclass
-class Issue:
-    number: int
-    title: str
-    description: str
-    path: str
-    status: str = "available"  # available, coming_soon, prototype
+# Where the issues and their manifests live
+ISSUES_ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'issues'))
+
+
+# Layout, in rows: the header box and a blank line, the details pane
+# (a blank line and its box) and the controls line below a blank one.
+# The spines get whatever is left.
+HEADER_ROWS = 5
+DESCRIPTION_LINES = 3  # wrapped description lines the details pane holds
+DETAILS_ROWS = 8 + DESCRIPTION_LINES
+CONTROLS_ROWS = 2
+BOX_WIDTH = 80
+SPINE_WIDTH = 76
 
 
 class RackOfZines:
     def __init__(self):
         self.theme = ArtisticThemes.MINIMAL
-        self.selected_index = 0
-        
-        # Define the catalog of issues
-        self.issues = [
-            Issue(1, "Winter Hush",
-                  "ASCII snow drifting down the terminal. Catch snowflakes to reveal fragments of text.",
-                  "issues/01-winter-hush/main.py"),
-            Issue(2, "Fragments.txt",
-                  "A scrolling stack of notes, quotes, diary lines. Stitch fragments into narrative.",
-                  "issues/02-fragments/main.py"),
-            Issue(3, "Gutter",
-                  "A comic reader in the terminal. ASCII panels navigated with arrow keys.",
-                  "issues/03-gutter/main.py"),
-            Issue(4, "Echo Chamber",
-                  "Anything typed echoes back distorted. Strange dialogue between user and machine.",
-                  "issues/04-echo-chamber/main.py"),
-            Issue(5, "Amber Light",
-                  "Retro amber terminal theme. Logs from a fictional machine, sci-fi diary entries.",
-                  "issues/05-amber-light/main.py"),
-            Issue(6, "Caret Cuts",
-                  "Very short one-shot TUIs. Words unraveling, ASCII constellations, conversations.",
-                  "issues/06-caret-cuts/main.py"),
-            Issue(7, "Exquisite Pane",
-                  "Collaborative exquisite-corpse comic. Contributors add panels to surreal zine.",
-                  "issues/exquisite-pane/main.py", "coming_soon"),
-            Issue(8, "The Prompt",
-                  "TUI asks questions. Your answers shape the story. Interactive fiction meets diary.",
-                  "issues/the-prompt/main.py", "coming_soon"),
-            Issue(9, "Monospace Dreams",
-                  "Dreamlike text fragments drift and recombine. Surreal, generative dream zine.",
-                  "issues/monospace-dreams/main.py", "coming_soon"),
-        ]
+        self.selected_index = 0  # position in shown
+        
+        # The catalog comes from each issue's issue.json, through a cached index
+        self.issues: List[Issue] = Catalog(ISSUES_ROOT).refresh()
+        
+        # Indices of the issues the filter lets through, in catalog order;
+        # only these are listed, and only the ones in the viewport drawn
+        self.shown: List[int] = list(range(len(self.issues)))
+        self.query: Optional[str] = None  # the filter being typed, None when not filtering
+        self._search: Optional[SearchIndex] = None  # built on the first keystroke
+        
+        # Warm workers for the isolated issues; started by run()
+        self.workers: Optional[WorkerPool] = None
+        
+        # Drawn through a diffing Screen, so moving the selection sends only
+        # the two spines and the details pane that changed
+        size = get_terminal_size()
+        self.screen = Screen(size.columns, size.lines, self.theme)
+        self.spine_rows = max(1, size.lines - HEADER_ROWS - DETAILS_ROWS - CONTROLS_ROWS)
+        self.top_index = 0  # position of the first spine in the viewport
+        
+        # Descriptions wrapped for the details pane, by issue index
+        self._wrapped: Dict[int, List[str]] = {}
     
     def draw_header(self):
         """Draw the rack header."""
-        print(f"{self.theme.accent}╔══════════════════════════════════════════════════════════════════════════════╗{self.theme.reset}")
-        print(f"{self.theme.accent}║{self.theme.primary}                              TinyTUIs Rack                                {self.theme.accent}║{self.theme.reset}")
-        print(f"{self.theme.accent}║{self.theme.secondary}                        A Small Press for the Terminal                       {self.theme.accent}║{self.theme.reset}")
-        print(f"{self.theme.accent}╚══════════════════════════════════════════════════════════════════════════════╝{self.theme.reset}")
-        print()
+        put, theme = self.screen.put_text, self.theme
+        inner = BOX_WIDTH - 2
+        put(0, 0, "╔" + "═" * inner + "╗", theme.accent)
+        for row, (text, color) in enumerate((("TinyTUIs Rack", theme.primary),
+                                             ("A Small Press for the Terminal", theme.secondary)), 1):
+            put(0, row, "║", theme.accent)
+            put(1, row, text.center(inner), color)
+            put(BOX_WIDTH - 1, row, "║", theme.accent)
+        put(0, 3, "╚" + "═" * inner + "╝", theme.accent)
     
-    def draw_issue_spine(self, issue: Issue, is_selected: bool, width: int = 76):
-        """Draw an issue as a spine on the rack."""
-        if is_selected:
-            bg = "\033[7m"  # Reverse video
+    def draw_issue_spine(self, position: int):
+        """Draw the issue at a position of the list as a spine, if it is in the viewport."""
+        row = position - self.top_index
+        if not 0 <= row < self.spine_rows:
+            return
+        row += HEADER_ROWS
+        if position >= len(self.shown):
+            self.screen.put_text(0, row, " " * SPINE_WIDTH)
+            return
+        
+        issue = self.issues[self.shown[position]]
+        if position == self.selected_index:
+            color = "\033[7m" + self.theme.accent  # Reverse video
             border_char = "█"
-            color = self.theme.accent
         else:
-            bg = ""
             border_char = "│"
-            if issue.status == "available":
+            if issue.status is Status.AVAILABLE:
                 color = self.theme.primary
-            elif issue.status == "coming_soon":
+            elif issue.status is Status.COMING_SOON:
                 color = self.theme.secondary
             else:
                 color = self.theme.text
         
         # Status indicator
-        if issue.status == "available":
+        if issue.status is Status.AVAILABLE:
             status_icon = "●"
-        elif issue.status == "coming_soon":
+        elif issue.status is Status.COMING_SOON:
             status_icon = "○"
         else:
             status_icon = "◐"
         
         # Format the spine
         number_str = f"#{issue.number:02d}"
-        title_space = width - len(number_str) - 8  # Account for borders and status
+        title_space = SPINE_WIDTH - len(number_str) - 8  # Account for borders and status
         
         if len(issue.title) > title_space:
             display_title = issue.title[:title_space-3] + "..."
         else:
             display_title = issue.title.ljust(title_space)
         
-        spine = f"{bg}{color}{border_char} {number_str} {status_icon} {display_title} {border_char}{self.theme.reset}"
-        print(spine)
+        spine = f"{border_char} {number_str} {status_icon} {display_title} {border_char}"
+        self.screen.put_text(0, row, spine.ljust(SPINE_WIDTH), color)
+    
+    def draw_spines(self):
+        """Draw every spine row of the viewport."""
+        for position in range(self.top_index, self.top_index + self.spine_rows):
+            self.draw_issue_spine(position)
     
-    def draw_issue_details(self, issue: Issue):
+    def wrapped_description(self, index: int) -> List[str]:
+        """An issue's description wrapped to the details pane; wrapped once per issue."""
+        lines = self._wrapped.get(index)
+        if lines is None:
+            lines = textwrap.wrap(self.issues[index].description, BOX_WIDTH - 6)
+            if len(lines) > DESCRIPTION_LINES:
+                lines = lines[:DESCRIPTION_LINES]
+                lines[-1] = lines[-1][:BOX_WIDTH - 9] + "..."
+            self._wrapped[index] = lines
+        return lines
+    
+    def draw_issue_details(self, position: int):
         """Draw detailed information about the selected issue."""
-        print()
-        print(f"{self.theme.accent}┌─ Issue Details ─────────────────────────────────────────────────────────────┐{self.theme.reset}")
-        print(f"{self.theme.accent}│{self.theme.reset}")
-        
-        # Title and number
-        title_line = f"  Issue #{issue.number}: {issue.title}"
-        padding = 78 - len(title_line)
-        print(f"{self.theme.accent}│{self.theme.primary}{title_line}{' ' * padding}{self.theme.accent}│{self.theme.reset}")
-        print(f"{self.theme.accent}│{' ' * 78}{self.theme.accent}│{self.theme.reset}")
-        
-        # Description (word wrap)
-        words = issue.description.split()
-        lines = []
-        current_line = "  "
-        
-        for word in words:
-            if len(current_line + word + " ") <= 76:
-                current_line += word + " "
-            else:
-                lines.append(current_line.rstrip())
-                current_line = "  " + word + " "
+        put, theme = self.screen.put_text, self.theme
+        inner = BOX_WIDTH - 2
+        top = HEADER_ROWS + self.spine_rows + 1
         
-        if current_line.strip():
-            lines.append(current_line.rstrip())
+        def boxed(row: int, text: str = "", color: Optional[str] = None):
+            put(0, top + row, "│", theme.accent)
+            put(1, top + row, text.ljust(inner), color or theme.text)
+            put(BOX_WIDTH - 1, top + row, "│", theme.accent)
         
-        for line in lines:
-            padding = 78 - len(line)
-            print(f"{self.theme.accent}│{self.theme.text}{line}{' ' * padding}{self.theme.accent}│{self.theme.reset}")
-        
-        print(f"{self.theme.accent}│{' ' * 78}{self.theme.accent}│{self.theme.reset}")
-        
-        # Status
-        if issue.status == "available":
-            status_text = f"  Status: {self.theme.primary}Available - Press ENTER to run{self.theme.text}"
-        elif issue.status == "coming_soon":
-            status_text = f"  Status: {self.theme.secondary}Coming Soon{self.theme.text}"
+        put(0, top, "┌─ Issue Details ".ljust(BOX_WIDTH - 1, "─") + "┐", theme.accent)
+        row = 4 + DESCRIPTION_LINES
+        boxed(1)
+        if position >= len(self.shown):
+            # The filter let nothing through
+            boxed(2, "  No issues match the filter.", theme.secondary)
+            for i in range(3, row + 2):
+                boxed(i)
         else:
-            status_text = f"  Status: {self.theme.secondary}Prototype{self.theme.text}"
+            index = self.shown[position]
+            issue = self.issues[index]
+            boxed(2, f"  Issue #{issue.number}: {issue.title}", theme.primary)
+            boxed(3)
+            
+            # Description, blank lines below it so a shorter one wipes a longer
+            lines = self.wrapped_description(index)
+            for i in range(DESCRIPTION_LINES):
+                boxed(4 + i, "  " + lines[i] if i < len(lines) else "")
+            boxed(row)
+            
+            # Status
+            if issue.status is Status.AVAILABLE:
+                status, color = "Available - Press ENTER to run", theme.primary
+            elif issue.status is Status.COMING_SOON:
+                status, color = "Coming Soon", theme.secondary
+            else:
+                status, color = "Prototype", theme.secondary
+            boxed(row + 1)
+            put(1, top + row + 1, "  Status: ", theme.text)
+            put(11, top + row + 1, status, color)
+        put(0, top + row + 2, "└".ljust(BOX_WIDTH - 1, "─") + "┘", theme.accent)
+    
+    def draw_controls(self, message: Optional[str] = None):
+        """Draw control instructions, or a message in their place."""
+        row = self.screen.height - 1
+        if message is not None:
+            text = message
+        elif self.query is not None:
+            text = f"Filter: {self.query}▏  ESC clears • ENTER Run Issue"
+            count = f"{len(self.shown)} of {len(self.issues)}"
+            text = text.ljust(BOX_WIDTH - len(count)) + count
+        else:
+            text = "Controls: ↑↓ PgUp PgDn Home End • / Filter • ENTER Run • q Quit"
+            if self.shown:
+                position = f"{self.selected_index + 1}/{len(self.shown)}"
+                text = text.ljust(BOX_WIDTH - len(position)) + position
+        self.screen.put_text(0, row, text.ljust(BOX_WIDTH), self.theme.secondary)
+    
+    def draw_rack(self):
+        """Draw the whole rack, for the first frame or after an issue had the terminal."""
+        hide_cursor()  # an issue may have left it showing
+        self.screen.clear()
+        self.screen.invalidate()
+        self.draw_header()
+        self.draw_spines()
+        self.draw_issue_details(self.selected_index)
+        self.draw_controls()
+        self.screen.present()
+    
+    def select(self, index: int):
+        """Move the selection to a position in the list, redrawing only what it changes."""
+        index = max(0, min(len(self.shown) - 1, index))
+        if index == self.selected_index:
+            return
+        previous, self.selected_index = self.selected_index, index
         
-        padding = 78 - len(status_text) + len(self.theme.primary) + len(self.theme.text)  # Account for color codes
-        print(f"{self.theme.accent}│{status_text}{' ' * (padding - len(self.theme.primary) - len(self.theme.text))}{self.theme.accent}│{self.theme.reset}")
+        if index < self.top_index:
+            self.top_index = index
+            self.draw_spines()
+        elif index >= self.top_index + self.spine_rows:
+            self.top_index = index - self.spine_rows + 1
+            self.draw_spines()
+        else:
+            self.draw_issue_spine(previous)
+            self.draw_issue_spine(index)
+        self.draw_issue_details(index)
+        self.draw_controls()
+    
+    def set_filter(self, query: Optional[str]):
+        """Show only the issues matching query (all of them for None or ''), keeping the selection if it matches."""
+        selected = self.shown[self.selected_index] if self.shown else None
+        self.query = query
+        if query:
+            if self._search is None:
+                self._search = SearchIndex(f"{issue.title} {issue.description}" for issue in self.issues)
+            self.shown = self._search.search(query)
+        else:
+            self.shown = list(range(len(self.issues)))
         
-        print(f"{self.theme.accent}└─────────────────────────────────────────────────────────────────────────────┘{self.theme.reset}")
+        self.selected_index = self.shown.index(selected) if selected in self.shown else 0
+        self.top_index = max(0, min(self.top_index, self.selected_index,
+                                    len(self.shown) - self.spine_rows))
+        if self.selected_index >= self.top_index + self.spine_rows:
+            self.top_index = self.selected_index - self.spine_rows + 1
+        self.draw_spines()
+        self.draw_issue_details(self.selected_index)
+        self.draw_controls()
     
-    def draw_controls(self):
-        """Draw control instructions."""
-        print()
-        print(f"{self.theme.secondary}Controls: ↑↓ Navigate • ENTER Run Issue • q Quit{self.theme.reset}")
+    def handle_key(self, event: KeyEvent) -> bool:
+        """Navigation and filter keys; False for anything else."""
+        if event == KEY_UP:
+            self.select(self.selected_index - 1)
+        elif event == KEY_DOWN:
+            self.select(self.selected_index + 1)
+        elif event == KEY_PAGE_UP:
+            self.select(self.selected_index - self.spine_rows)
+        elif event == KEY_PAGE_DOWN:
+            self.select(self.selected_index + self.spine_rows)
+        elif event == KEY_HOME:
+            self.select(0)
+        elif event == KEY_END:
+            self.select(len(self.shown) - 1)
+        elif self.query is None:
+            if event.key != "/":
+                return False
+            self.set_filter("")
+        elif event == KEY_ESCAPE:
+            self.set_filter(None)
+        elif event == KEY_BACKSPACE:
+            # Backspace on an empty filter leaves filtering
+            self.set_filter(self.query[:-1] if self.query else None)
+        elif event.char:
+            self.set_filter(self.query + event.char)
+        else:
+            return False
+        return True
+    
+    def wait_for_enter(self, keys: KeyReader, prompt: str):
+        """Show a prompt and wait for ENTER on the rack's reader (input() needs cooked mode)."""
+        if prompt:
+            print(f"{self.theme.text}{prompt}{self.theme.reset}", end="", flush=True)
+        while not keys.closed:
+            try:
+                events = keys.poll(timeout=None)
+            except KeyboardInterrupt:
+                return
+            if any(event == KEY_ENTER or event == CTRL_C for event in events):
+                return
+    
+    def notice(self, keys: KeyReader, message: str):
+        """Show a message on the controls line until ENTER."""
+        self.draw_controls(message)
+        self.screen.present()
+        self.wait_for_enter(keys, "")
+        self.draw_controls()
     
-    def run_issue(self, issue: Issue):
-        """Run the selected issue."""
-        if issue.status != "available":
-            print(f"\n{self.theme.secondary}This issue is not yet available.{self.theme.reset}")
-            input(f"{self.theme.text}Press ENTER to continue...{self.theme.reset}")
+    def run_issue(self, issue: Issue, keys: KeyReader):
+        """Run the selected issue in this process, on the rack's reader."""
+        if issue.status is not Status.AVAILABLE:
+            self.notice(keys, "This issue is not yet available. Press ENTER to continue...")
             return
         
         if not os.path.exists(issue.path):
-            print(f"\n{self.theme.secondary}Issue file not found: {issue.path}{self.theme.reset}")
-            input(f"{self.theme.text}Press ENTER to continue...{self.theme.reset}")
+            self.notice(keys, f"Issue file not found: {issue.path}. Press ENTER to continue...")
             return
         
         clear_screen()
         print(f"{self.theme.accent}Launching {issue.title}...{self.theme.reset}")
         print()
         
-        try:
-            # Run the issue
-            subprocess.run([sys.executable, issue.path], check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"\n{self.theme.secondary}Error running issue: {e}{self.theme.reset}")
-        except KeyboardInterrupt:
-            print(f"\n{self.theme.secondary}Issue interrupted.{self.theme.reset}")
+        if issue.isolated and self.workers is not None:
+            # A pre-forked worker already has everything imported
+            code = self.workers.launch(issue.path, issue.entry)
+            # A worker that crashed never switched its mouse and paste reports off
+            keys.reclaim()
+            if code:
+                print(f"\n{self.theme.secondary}Issue exited with status {code}.{self.theme.reset}")
+        else:
+            try:
+                # Imported once and cached, so relaunching costs only the issue's own setup
+                launch(issue.path, issue.entry, keys)
+            except Exception as e:
+                # A broken issue should not take the rack down with it
+                print(f"\n{self.theme.secondary}Error running issue: {e!r}{self.theme.reset}")
         
         print()
-        input(f"{self.theme.text}Press ENTER to return to the rack...{self.theme.reset}")
+        self.wait_for_enter(keys, "Press ENTER to return to the rack...")
+        # The issue had the terminal; nothing of the rack is left on it
+        self.draw_rack()
     
     def show_intro(self):
         """Show the intro sequence."""
@@ -199,41 +341,44 @@ class RackOfZines:
         """Main program loop."""
         self.show_intro()
         
-        while True:
-            clear_screen()
-            self.draw_header()
-            
-            # Draw all issue spines
-            for i, issue in enumerate(self.issues):
-                self.draw_issue_spine(issue, i == self.selected_index)
-            
-            # Draw details for selected issue
-            if 0 <= self.selected_index < len(self.issues):
-                self.draw_issue_details(self.issues[self.selected_index])
-            
-            self.draw_controls()
-            
-            # Get input
-            try:
-                key = SimpleInput.get_key()
+        isolated = [(issue.path, issue.entry) for issue in self.issues
+                    if issue.isolated and os.path.exists(issue.path)]
+        if isolated and hasattr(os, "fork"):
+            self.workers = WorkerPool(preload=isolated)
+        
+        try:
+            # One reader for the whole session; issues launched from here borrow it
+            with KeyReader() as keys:
+                self.draw_rack()
+                browsing = True
+                while browsing:
+                    # Get input
+                    try:
+                        events = keys.poll(timeout=None)
+                        if keys.closed:
+                            break
+                    except KeyboardInterrupt:
+                        break
                 
-                if key == 'q' or key == '\x03':  # q or Ctrl+C
-                    break
-                elif key == '\r' or key == '\n':  # Enter
-                    if 0 <= self.selected_index < len(self.issues):
-                        self.run_issue(self.issues[self.selected_index])
-                elif key == '\x1b':  # Escape sequence (arrow keys)
-                    next1 = SimpleInput.get_key()
-                    if next1 == '[':
-                        next2 = SimpleInput.get_key()
-                        if next2 == 'A':  # Up arrow
-                            self.selected_index = max(0, self.selected_index - 1)
-                        elif next2 == 'B':  # Down arrow
-                            self.selected_index = min(len(self.issues) - 1, self.selected_index + 1)
+                    for event in events:
+                        if event == CTRL_C or (event.key == 'q' and self.query is None):
+                            browsing = False
+                            break
+                        elif event == KEY_ENTER:
+                            if self.shown:
+                                self.run_issue(self.issues[self.shown[self.selected_index]], keys)
+                            break  # keys typed during the issue were not meant for us
+                        self.handle_key(event)
                 
-            except KeyboardInterrupt:
-                break
+                    # Send whatever the keys changed, all in one frame
+                    self.screen.present()
         
+        finally:
+            # However we leave, hand back the terminal and stop the warm workers
+            if self.workers is not None:
+                self.workers.close()
+                self.workers = None
+            show_cursor()
         clear_screen()
         print(f"{self.theme.accent}Thank you for browsing TinyTUIs{self.theme.reset}")
         print(f"{self.theme.secondary}Where terminal interfaces become art{self.theme.reset}")